@@ -7,11 +7,17 @@ CodeQL query template: list_functions.ql in this directory (plugins/cpp/list_fun
 from __future__ import annotations
 
 import csv
+import io
 import logging
 import os
 import subprocess
 import shutil
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from stat import S_ISDIR
 
 from futagassist.analysis.codeql_runner import CodeQLRunner
 from futagassist.core.registry import ComponentRegistry
@@ -19,70 +25,223 @@ from futagassist.core.schema import FunctionInfo, UsageContext
 
 log = logging.getLogger(__name__)
 
+#: Directory holding the bundled .ql files (this plugin's directory), resolved once at import.
+_QUERY_DIR = Path(__file__).resolve().parent
+
+
+def _codeql_home() -> str | None:
+    """CODEQL_HOME from the environment (None when unset or empty); the cache key below."""
+    return os.environ.get("CODEQL_HOME") or None
+
+
+def _codeql_lookup_key() -> tuple[str | None, str | None]:
+    """(CODEQL_HOME, PATH) cache key for lookups that fall back to searching PATH.
+
+    PATH is only part of the key when CODEQL_HOME is unset, since it is not
+    searched otherwise.
+    """
+    codeql_home = _codeql_home()
+    return codeql_home, None if codeql_home else os.environ.get("PATH")
+
+
+# Bundle: CODEQL_HOME/codeql; some installs: CODEQL_HOME/bin/codeql
+_CODEQL_HOME_CANDIDATES = ("codeql", "bin/codeql")
+
+#: The cpp pack inside a bundle root; its presence marks a bundle layout.
+_BUNDLE_CPP_PACK = Path("qlpacks", "codeql", "cpp-all")
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    """One stat() of ``path`` (following symlinks), or None if it does not exist."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _find_in_codeql_home(codeql_home: str) -> Path | None:
+    """First existing codeql binary candidate under CODEQL_HOME (one stat per candidate)."""
+    home = Path(codeql_home).resolve()
+    for subpath in _CODEQL_HOME_CANDIDATES:
+        candidate = home / subpath
+        if _stat_or_none(candidate) is not None:
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=8)
+def _resolve_codeql_bin(codeql_home: str | None) -> str:
+    """Resolve the codeql binary for a given CODEQL_HOME (cached per value)."""
+    if codeql_home:
+        found = _find_in_codeql_home(codeql_home)
+        return str(found or Path(codeql_home).resolve() / "bin" / "codeql")
+    return "codeql"
+
+
+@lru_cache(maxsize=8)
+def _resolve_codeql_binary_path(codeql_home: str | None, path_env: str | None) -> Path | None:
+    """Absolute path of the codeql binary for a given CODEQL_HOME and PATH (cached per pair).
+
+    With CODEQL_HOME set only its candidates are checked; ``path_env`` is searched otherwise.
+    """
+    if codeql_home:
+        found = _find_in_codeql_home(codeql_home)
+        return found.resolve() if found else None
+    on_path = shutil.which("codeql", path=path_env)
+    return Path(on_path).resolve() if on_path else None
+
+
+@lru_cache(maxsize=8)
+def _resolve_is_bundle_install(codeql_home: str | None, path_env: str | None) -> bool:
+    """Bundle-layout check for a given CODEQL_HOME and PATH (cached per pair)."""
+    binary_path = _resolve_codeql_binary_path(codeql_home, path_env)
+    if not binary_path:
+        return False
+    # Check if qlpacks/ is a sibling or in parent (bundle layouts); cpp-all implies qlpacks/
+    for base in (binary_path.parent, binary_path.parent.parent):
+        st = _stat_or_none(base / _BUNDLE_CPP_PACK)
+        if st is not None and S_ISDIR(st.st_mode):
+            return True
+    return False
+
+
+def _reset_codeql_caches() -> None:
+    """Forget cached CodeQL install lookups (e.g. after installing CodeQL or in tests)."""
+    _resolve_codeql_bin.cache_clear()
+    _resolve_codeql_binary_path.cache_clear()
+    _resolve_is_bundle_install.cache_clear()
+
 
 def _codeql_bin() -> str:
     """Resolve codeql binary (respect CODEQL_HOME like build stage)."""
-    if os.environ.get("CODEQL_HOME"):
-        home = Path(os.environ["CODEQL_HOME"]).resolve()
-        # Bundle: CODEQL_HOME/codeql; some installs: CODEQL_HOME/bin/codeql
-        for subpath in ("codeql", "bin/codeql"):
-            candidate = home / subpath
-            if candidate.exists():
-                return str(candidate)
-        return str(home / "bin" / "codeql")
-    return "codeql"
+    return _resolve_codeql_bin(_codeql_home())
 
 
 def _codeql_binary_path() -> Path | None:
     """Return absolute path to the codeql binary, or None if not found."""
-    bin_str = _codeql_bin()
-    if os.path.isabs(bin_str) or "/" in bin_str:
-        p = Path(bin_str).resolve()
-        return p if p.exists() else None
-    found = shutil.which(bin_str)
-    return Path(found).resolve() if found else None
+    return _resolve_codeql_binary_path(*_codeql_lookup_key())
 
 
 def _is_bundle_install() -> bool:
     """True if CodeQL appears to be a bundle install (binary and qlpacks in same tree).
-    
+
     In a bundle, we should NOT pass --search-path because CodeQL auto-discovers
     its packs from the distribution root.
     """
-    binary_path = _codeql_binary_path()
-    if not binary_path:
-        return False
-    # Check if qlpacks/ is a sibling or in parent (bundle layouts)
-    for base in (binary_path.parent, binary_path.parent.parent):
-        qlpacks = base / "qlpacks"
-        if qlpacks.is_dir() and (qlpacks / "codeql" / "cpp-all").is_dir():
-            return True
-    return False
+    return _resolve_is_bundle_install(*_codeql_lookup_key())
 
 
 def _codeql_search_path() -> list[Path]:
     """Directories for CodeQL to find QL packs (e.g. codeql/cpp-all).
 
-    When running from a CodeQL bundle, returns empty list (CodeQL auto-discovers packs).
-    Only returns paths for non-bundle installs or when CODEQL_REPO is set.
+    Only CODEQL_REPO (when it is an existing directory) is returned; otherwise the list
+    is empty and a bundle install auto-discovers its packs.
     """
-    # Bundle installs should use CodeQL's auto-discovery, not --search-path
-    if _is_bundle_install() and not os.environ.get("CODEQL_REPO"):
+    # CODEQL_REPO (user-set, for custom queries repo)
+    repo = os.environ.get("CODEQL_REPO")
+    if not repo:
         return []
+    # abspath instead of resolve(): no per-component realpath walk, one stat below
+    path = Path(os.path.abspath(repo))
+    return [path] if path.is_dir() else []
 
-    seen: set[Path] = set()
-    out: list[Path] = []
 
-    def add(p: Path) -> None:
-        if p.exists() and p not in seen:
-            seen.add(p)
-            out.append(p)
+#: Seconds one ``codeql bqrs decode`` may run before it is killed.
+BQRS_DECODE_TIMEOUT = 120
 
-    # CODEQL_REPO (user-set, for custom queries repo)
-    if os.environ.get("CODEQL_REPO"):
-        add(Path(os.environ["CODEQL_REPO"]).resolve())
+#: Concurrent ``codeql bqrs decode`` runs (one per query result).
+BQRS_DECODE_WORKERS = 4
 
-    return out
+
+def _decode_bqrs_rows(
+    codeql_bin: str, bqrs_path: Path, timeout: float = BQRS_DECODE_TIMEOUT
+) -> Iterator[list[str]]:
+    """Yield CSV rows of ``codeql bqrs decode`` as they come off the pipe.
+
+    Raises CalledProcessError once the stream ends if the decoder failed (or was
+    killed on timeout), so callers can drop what they parsed from it.
+    """
+    cmd = [codeql_bin, "bqrs", "decode", "--format=csv", "--no-titles", "--", str(bqrs_path)]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        killer = threading.Timer(timeout, proc.kill)
+        killer.start()
+        try:
+            text = io.TextIOWrapper(proc.stdout, encoding="utf-8", errors="replace", newline="")
+            yield from csv.reader(text)
+            returncode = proc.wait()
+        finally:
+            killer.cancel()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+#: Query results are joined on (file_path, line, name).
+_RowKey = tuple[str, int, str]
+
+
+def _row_key(row: list[str]) -> _RowKey:
+    """(file_path, line, name) of a decoded row; an unparsable line becomes 0."""
+    try:
+        line = int(row[1]) if row[1].strip() else 0
+    except ValueError:
+        line = 0
+    return (row[0] or "").strip(), line, (row[2] or "").strip()
+
+
+def _parse_function_rows(rows: Iterable[list[str]]) -> list[FunctionInfo]:
+    """list_functions rows: file_path, line, name, qualified_name, return_type, _, params."""
+    functions: list[FunctionInfo] = []
+    for row in rows:
+        if len(row) < 4:
+            continue
+        file_path, line, name = _row_key(row)
+        qualified_name = (row[3] or "").strip() or name
+        return_type = (row[4] or "").strip() if len(row) > 4 else ""
+        params_str = (row[6] or "").strip() if len(row) > 6 else ""
+        parameters = [p.strip() for p in params_str.split(",") if p.strip()]
+        signature = f"{return_type} {qualified_name}({params_str})"
+        functions.append(
+            FunctionInfo(
+                name=name,
+                signature=signature,
+                return_type=return_type,
+                parameters=parameters,
+                file_path=file_path,
+                line=line,
+                includes=[],
+                context="",
+            )
+        )
+    return functions
+
+
+def _parse_key_rows(rows: Iterable[list[str]]) -> set[_RowKey]:
+    """api_functions / fuzz_targets rows: the set of function keys they name."""
+    return {_row_key(row) for row in rows if len(row) >= 4}
+
+
+def _parse_semantics_rows(rows: Iterable[list[str]]) -> dict[_RowKey, list[str]]:
+    """parameter_semantics rows: file_path, line, name, param_index, semantic_role.
+
+    Rows with a malformed or negative param_index are skipped.
+    """
+    semantics: dict[_RowKey, list[str]] = {}
+    for row in rows:
+        if len(row) < 4:
+            continue
+        try:
+            param_index = int(row[3]) if row[3].strip() else 0
+        except ValueError:
+            continue
+        if param_index < 0:
+            continue
+        semantic_role = (row[4] or "UNKNOWN").strip() if len(row) > 4 else "UNKNOWN"
+        roles = semantics.setdefault(_row_key(row), [])
+        # Extend list so index param_index is at position param_index
+        while len(roles) <= param_index:
+            roles.append("UNKNOWN")
+        roles[param_index] = semantic_role
+    return semantics
 
 
 class CppAnalyzer:
@@ -91,22 +250,29 @@ class CppAnalyzer:
     language = "cpp"
 
     def __init__(self) -> None:
-        self._query_dir = Path(__file__).resolve().parent
+        self._query_dir = _QUERY_DIR
         self._list_functions_ql = self._query_dir / "list_functions.ql"
         self._api_functions_ql = self._query_dir / "api_functions.ql"
         self._fuzz_targets_ql = self._query_dir / "fuzz_targets.ql"
         self._parameter_semantics_ql = self._query_dir / "parameter_semantics.ql"
+        # Existing query files, checked on first use; a new analyzer sees the filesystem again
+        self._queries: tuple[Path, ...] | None = None
         self._runner = CodeQLRunner(codeql_bin=_codeql_bin())
 
     def get_codeql_queries(self) -> list[Path]:
         """Return paths to CodeQL query files: list_functions, api_functions, fuzz_targets, parameter_semantics."""
-        out: list[Path] = []
-        for q in (self._list_functions_ql, self._api_functions_ql, self._fuzz_targets_ql, self._parameter_semantics_ql):
-            if q.exists():
-                out.append(q)
-        if not out:
-            out = [self._list_functions_ql] if self._list_functions_ql.exists() else []
-        return out
+        if self._queries is None:
+            self._queries = tuple(
+                p
+                for p in (
+                    self._list_functions_ql,
+                    self._api_functions_ql,
+                    self._fuzz_targets_ql,
+                    self._parameter_semantics_ql,
+                )
+                if p.is_file()
+            )
+        return list(self._queries)
 
     def extract_functions(self, db_path: Path) -> list[FunctionInfo]:
         """Run CodeQL list_functions query, decode BQRS to CSV, parse into FunctionInfo."""
@@ -157,24 +323,10 @@ class CppAnalyzer:
             log.warning("No BQRS files under %s", results_dir)
             return []
 
-        codeql_bin = _codeql_bin()
-        api_set: set[tuple[str, int, str]] = set()
-        fuzz_set: set[tuple[str, int, str]] = set()
-        semantics_map: dict[tuple[str, int, str], list[str]] = {}
-
-        def decode_bqrs(bqrs_path: Path) -> str:
-            res = subprocess.run(
-                [codeql_bin, "bqrs", "decode", "--format=csv", "--no-titles", "--", str(bqrs_path)],
-                capture_output=True,
-                timeout=120,
-                check=False,
-            )
-            if res.returncode != 0:
-                return ""
-            return (res.stdout or b"").decode("utf-8", errors="replace")
-
         def query_kind(path: Path) -> str:
-            s = path.as_posix()
+            # Match below results/ only, so a database path that happens to contain a query name
+            # does not classify every result as that query
+            s = path.relative_to(results_dir).as_posix()
             if "list_functions" in s:
                 return "list_functions"
             if "api_functions" in s:
@@ -185,101 +337,60 @@ class CppAnalyzer:
                 return "parameter_semantics"
             return ""
 
-        functions_list: list[FunctionInfo] = []
-        for bqrs_path in bqrs_files:
-            kind = query_kind(bqrs_path)
-            if not kind:
-                continue
+        # Auxiliary results (api, fuzz, parameter_semantics) only tag list_functions rows:
+        # without list_functions, run it alone before decoding anything, and give up if it
+        # still has no result
+        if not any(query_kind(p) == "list_functions" for p in bqrs_files):
+            queries_only_list = [self._list_functions_ql]
+            result2 = self._runner.run_queries(
+                db,
+                queries_only_list,
+                timeout=600,
+                search_path=search_path if search_path else None,
+            )
+            if result2.returncode == 0:
+                bqrs_files = list(results_dir.rglob("*.bqrs"))
+            if not any(query_kind(p) == "list_functions" for p in bqrs_files):
+                log.warning("No list_functions results under %s", results_dir)
+                return []
+
+        codeql_bin = _codeql_bin()
+        api_set: set[_RowKey] = set()
+        fuzz_set: set[_RowKey] = set()
+        semantics_map: dict[_RowKey, list[str]] = {}
+
+        def decode_and_parse(
+            job: tuple[Path, str],
+        ) -> list[FunctionInfo] | set[_RowKey] | dict[_RowKey, list[str]] | None:
+            bqrs_path, kind = job
+            rows = _decode_bqrs_rows(codeql_bin, bqrs_path)
             try:
-                csv_text = decode_bqrs(bqrs_path)
-                if not csv_text:
-                    continue
-                reader = csv.reader(csv_text.strip().splitlines())
-                for row in reader:
-                    if len(row) < 4:
-                        continue
-                    file_path = (row[0] or "").strip()
-                    try:
-                        line = int(row[1]) if row[1].strip() else 0
-                    except ValueError:
-                        line = 0
-                    name = (row[2] or "").strip()
-                    key = (file_path, line, name)
-
-                    if kind == "list_functions":
-                        qualified_name = (row[3] or "").strip() or name
-                        return_type = (row[4] or "").strip() if len(row) > 4 else ""
-                        params_str = (row[6] or "").strip() if len(row) > 6 else ""
-                        parameters = [p.strip() for p in params_str.split(",") if p.strip()]
-                        signature = f"{return_type} {qualified_name}({params_str})"
-                        functions_list.append(
-                            FunctionInfo(
-                                name=name,
-                                signature=signature,
-                                return_type=return_type,
-                                parameters=parameters,
-                                file_path=file_path,
-                                line=line,
-                                includes=[],
-                                context="",
-                            )
-                        )
-                    elif kind == "api_functions":
-                        api_set.add(key)
-                    elif kind == "fuzz_targets":
-                        fuzz_set.add(key)
-                    elif kind == "parameter_semantics":
-                        # row: file_path, line, name, param_index, semantic_role
-                        param_index = int(row[3]) if len(row) > 3 and row[3].strip() else 0
-                        semantic_role = (row[4] or "UNKNOWN").strip() if len(row) > 4 else "UNKNOWN"
-                        if key not in semantics_map:
-                            semantics_map[key] = []
-                        # Extend list so index param_index is at position param_index
-                        while len(semantics_map[key]) <= param_index:
-                            semantics_map[key].append("UNKNOWN")
-                        semantics_map[key][param_index] = semantic_role
-            except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+                if kind == "list_functions":
+                    return _parse_function_rows(rows)
+                if kind == "parameter_semantics":
+                    return _parse_semantics_rows(rows)
+                return _parse_key_rows(rows)
+            except (subprocess.CalledProcessError, OSError, ValueError) as e:
                 log.debug("Decode/parse error for %s (%s): %s", bqrs_path, kind, e)
+                return None
 
-        # If we only have auxiliary queries (api, fuzz, parameter_semantics) and no list_functions, run list_functions alone
-        if not functions_list and (api_set or fuzz_set or semantics_map):
-            queries_only_list = [self._list_functions_ql]
-            result2 = self._runner.run_queries(db, queries_only_list, timeout=600, search_path=search_path if search_path else None)
-            if result2.returncode == 0:
-                bqrs_again = list((db / "results").rglob("*.bqrs"))
-                for bqrs_path in bqrs_again:
-                    if "list_functions" not in bqrs_path.as_posix():
-                        continue
-                    csv_text = decode_bqrs(bqrs_path)
-                    if not csv_text:
-                        continue
-                    for row in csv.reader(csv_text.strip().splitlines()):
-                        if len(row) < 4:
-                            continue
-                        file_path = (row[0] or "").strip()
-                        try:
-                            line = int(row[1]) if row[1].strip() else 0
-                        except ValueError:
-                            line = 0
-                        name = (row[2] or "").strip()
-                        qualified_name = (row[3] or "").strip() or name
-                        return_type = (row[4] or "").strip() if len(row) > 4 else ""
-                        params_str = (row[6] or "").strip() if len(row) > 6 else ""
-                        parameters = [p.strip() for p in params_str.split(",") if p.strip()]
-                        signature = f"{return_type} {qualified_name}({params_str})"
-                        functions_list.append(
-                            FunctionInfo(
-                                name=name,
-                                signature=signature,
-                                return_type=return_type,
-                                parameters=parameters,
-                                file_path=file_path,
-                                line=line,
-                                includes=[],
-                                context="",
-                            )
-                        )
-                    break
+        # Each decode is its own subprocess; run them side by side and merge in file order.
+        jobs = [(path, kind) for path in bqrs_files if (kind := query_kind(path))]
+        with ThreadPoolExecutor(max_workers=max(1, min(BQRS_DECODE_WORKERS, len(jobs)))) as pool:
+            parsed_results = list(pool.map(decode_and_parse, jobs))
+
+        functions_list: list[FunctionInfo] = []
+        for (_, kind), parsed in zip(jobs, parsed_results):
+            if parsed is None:
+                continue
+            if kind == "list_functions":
+                functions_list.extend(parsed)
+            elif kind == "api_functions":
+                api_set |= parsed
+            elif kind == "fuzz_targets":
+                fuzz_set |= parsed
+            else:
+                semantics_map.update(parsed)
 
         # Merge: tag each function with is_api, is_fuzz_target_candidate, parameter_semantics
         for fn in functions_list:
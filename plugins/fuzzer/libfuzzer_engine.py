@@ -111,20 +111,21 @@ class LibFuzzerEngine:
 
     def parse_crashes(self, artifact_dir: Path) -> list[CrashInfo]:
         """Parse crash/leak/timeout artifacts from a directory."""
-        artifact_dir = Path(artifact_dir)
-        if not artifact_dir.is_dir():
+        # scandir entries answer is_file() from the directory listing, without a stat per file
+        try:
+            with os.scandir(artifact_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
         crashes: list[CrashInfo] = []
-        for f in sorted(artifact_dir.iterdir()):
-            if not f.is_file():
-                continue
-            name = f.name.lower()
-            if any(name.startswith(prefix) for prefix in ("crash-", "leak-", "timeout-", "oom-")):
+        for entry in entries:
+            name = entry.name.lower()
+            if name.startswith(_ARTIFACT_PREFIXES) and entry.is_file():
                 warn_class = name.split("-")[0].upper()
                 crashes.append(CrashInfo(
-                    artifact_path=str(f),
-                    summary=f"{warn_class} artifact: {f.name}",
+                    artifact_path=entry.path,
+                    summary=f"{warn_class} artifact: {entry.name}",
                     warn_class=warn_class,
                 ))
 
@@ -201,6 +202,9 @@ class LibFuzzerEngine:
 # Helpers
 # ---------------------------------------------------------------------------
 
+#: Artifact file prefixes libFuzzer writes (lower-cased), each naming its warn class
+_ARTIFACT_PREFIXES = ("crash-", "leak-", "timeout-", "oom-")
+
 _DURATION_RE = re.compile(r"Done\s+\d+\s+runs\s+in\s+(\d+)\s+second")
 _EXECS_RE = re.compile(r"exec/s:\s+(\d+)")
 
@@ -214,10 +218,16 @@ def _parse_duration(stderr: str) -> float:
 
 
 def _parse_execs_per_sec(stderr: str) -> float:
-    """Extract execs/s from libFuzzer output."""
-    matches = _EXECS_RE.findall(stderr)
-    if matches:
-        return float(matches[-1])  # last reported value
+    """Extract execs/s from libFuzzer output (the last reported value).
+
+    Searches backwards from the end, so long progress logs are not scanned in full.
+    """
+    pos = stderr.rfind("exec/s:")
+    while pos >= 0:
+        m = _EXECS_RE.match(stderr, pos)
+        if m:
+            return float(m.group(1))
+        pos = stderr.rfind("exec/s:", 0, pos)
     return 0.0
 
 
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import stat
+from functools import lru_cache
 from pathlib import Path
 
 from futagassist.core.schema import FunctionInfo
 
 
+@lru_cache(maxsize=256)
+def _read_lines(path: str, mtime_ns: int) -> tuple[str, ...]:
+    """Lines of a source file; cached per (path, mtime) so each file is read once."""
+    return tuple(Path(path).read_text(encoding="utf-8", errors="replace").splitlines())
+
+
 def enrich_functions(
     functions: list[FunctionInfo],
     repo_path: Path,
@@ -27,11 +35,12 @@ def enrich_functions(
             result.append(f)
             continue
         src = repo_path / f.file_path if not Path(f.file_path).is_absolute() else Path(f.file_path)
-        if not src.is_file():
-            result.append(f)
-            continue
         try:
-            lines = src.read_text(encoding="utf-8", errors="replace").splitlines()
+            st = src.stat()
+            if not stat.S_ISREG(st.st_mode):
+                result.append(f)
+                continue
+            lines = _read_lines(str(src), st.st_mtime_ns)
         except OSError:
             result.append(f)
             continue
@@ -23,6 +23,7 @@ def build_log_context(
     """
     Attach a file handler to the build logger for the duration of the context.
     Log file is UTF-8; format: timestamp [LEVEL] message.
+    The handler is closed on exit, releasing the log file.
     """
     logger = get_logger()
     level = logging.DEBUG if verbose else logging.INFO
@@ -38,3 +39,4 @@ def build_log_context(
         yield logger
     finally:
         logger.removeHandler(handler)
+        handler.close()
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import os
 import re
+import stat
 import subprocess
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from futagassist.build.build_log import get_logger
@@ -58,6 +60,23 @@ _RE_LOG_PREFIX = re.compile(
     r"^\[\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\]\s*\[(?:build-stdout|build-stderr|ERROR)\]\s*"
 )
 
+# Keywords that indicate an error line (after stripping envelope); one scan per line
+_RE_ERROR_KEYWORD = re.compile(
+    r"[Ee]rror|[Ff]atal|[Ff]ailed|not found|undefined reference|No such file|cannot find"
+    r"|No rule to make|missing"
+)
+
+_RE_EXIT_STATUS = re.compile(r"Exit status (\d+)", re.IGNORECASE)
+
+# Short verbose context lines (no timestamp left) skipped when condensing errors
+_VERBOSE_CONTEXT_PREFIXES = ("Initializing database", "Running build command", "Running command in")
+
+# Deterministic fixes for common failures (same rules as FIX_PROMPT); checked before the LLM
+_KNOWN_FIXES: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(r"LT_PATH_LD|LT_INIT|ltmain\.sh not found"), "libtoolize && autoreconf -fi"),
+    (re.compile(r"libpsl\b.*not found"), "apt-get install -y libpsl-dev"),
+]
+
 
 def _strip_log_envelope(line: str) -> str:
     """Remove datetime and channel prefix (build-stdout, build-stderr, ERROR) from a log line."""
@@ -68,68 +87,74 @@ def _condense_error_for_llm(error_output: str, max_chars: int = MAX_LLM_ERROR_CH
     """
     Produce a short summary for the LLM: strip log envelope (datetime, build-stdout/stderr),
     keep only basic build context and actual error lines (error, fatal, not found, failed, etc.).
+    Only the last max_chars characters are kept, so lines are scanned from the end and
+    scanning stops once the budget is exceeded.
     """
     lines = error_output.splitlines()
-    summary_lines: list[str] = []
-    exit_status: str | None = None
-
-    # Keywords that indicate an error line (after stripping envelope)
-    error_keywords = (
-        "error",
-        "Error",
-        "fatal",
-        "Fatal",
-        "not found",
-        "failed",
-        "Failed",
-        "undefined reference",
-        "No such file",
-        "cannot find",
-        "were not found",
-        "not found where",
-        "No rule to make",
-        "missing",
+    # Context: exit status from the first "A fatal error occurred: Exit status N" line (once)
+    fatal_index = next(
+        (
+            i
+            for i, text in enumerate(lines)
+            if "A fatal error occurred" in text or "Exit status" in text
+        ),
+        None,
     )
 
-    seen_fatal = False
-    for raw_line in lines:
-        line = _strip_log_envelope(raw_line)
+    summary_lines: list[str] = []  # collected last line first
+    total = -1  # length of "\n".join(summary_lines)
+    for index in range(len(lines) - 1, -1, -1):
+        line = _strip_log_envelope(lines[index])
         if not line:
             continue
-        # Keep context: exit status from "A fatal error occurred: Exit status N" (once)
-        if ("A fatal error occurred" in line or "Exit status" in line) and not seen_fatal:
-            match = re.search(r"Exit status (\d+)", line, re.IGNORECASE)
-            if match:
-                exit_status = match.group(1)
-            summary_lines.append("Build failed (exit status {}).".format(exit_status or "non-zero"))
-            seen_fatal = True
-            continue
-        # Keep short context lines (no timestamp left)
-        if line.startswith("Initializing database") or line.startswith("Running build command") or line.startswith("Running command in"):
-            continue  # skip verbose context
-        # Keep lines that look like errors
-        if any(kw in line for kw in error_keywords):
-            summary_lines.append(line)
+        if index == fatal_index:
+            match = _RE_EXIT_STATUS.search(line)
+            line = "Build failed (exit status {}).".format(match.group(1) if match else "non-zero")
+        # Skip short verbose context lines (no timestamp left)
+        elif line.startswith(_VERBOSE_CONTEXT_PREFIXES):
             continue
-        # Keep "configure: error:" style lines (configure script errors)
-        if "configure:" in line and (":" in line):
-            summary_lines.append(line)
+        # Keep lines that look like errors, and "configure: error:" style lines
+        # (configure script errors)
+        elif not (_RE_ERROR_KEYWORD.search(line) or "configure:" in line):
             continue
+        summary_lines.append(line)
+        total += len(line) + 1
+        if total > max_chars:
+            break
 
-    condensed = "\n".join(summary_lines)
-    if not condensed.strip():
+    if not summary_lines:
         # Fallback: strip envelope from all lines and take last N chars
-        stripped = "\n".join(_strip_log_envelope(l) for l in lines if _strip_log_envelope(l))
-        condensed = stripped[-max_chars:] if len(stripped) > max_chars else stripped
-        if condensed != stripped:
-            condensed = "(output truncated; showing last {} chars)\n{}".format(max_chars, condensed)
-    elif len(condensed) > max_chars:
+        total = -1
+        for raw_line in reversed(lines):
+            line = _strip_log_envelope(raw_line)
+            if line:
+                summary_lines.append(line)
+                total += len(line) + 1
+                if total > max_chars:
+                    break
+
+    condensed = "\n".join(reversed(summary_lines))
+    if len(condensed) > max_chars:
         condensed = "(output truncated; showing last {} chars)\n{}".format(
             max_chars, condensed[-max_chars:]
         )
     return condensed
 
 
+def _match_known_fix(error_output: str) -> str | None:
+    """Return the fix command for the first known failure pattern in error_output, or None."""
+    for pattern, fix_cmd in _KNOWN_FIXES:
+        if pattern.search(error_output):
+            return fix_cmd
+    return None
+
+
+@lru_cache(maxsize=16)
+def _encoded_build_script(full_build_cmd: str) -> bytes:
+    """Return the wrapper script for full_build_cmd as UTF-8 bytes (cached across retries)."""
+    return f"#!/bin/sh\nset -e\n{full_build_cmd}\n".encode()
+
+
 def _inject_configure_options(build_commands: list[str], configure_options: str) -> list[str]:
     """
     Append configure_options to the first configure step in build_commands.
@@ -182,9 +207,14 @@ class BuildOrchestrator:
         build commands; path is resolved relative to repo_path if not absolute.
         If configure_options is set, extra flags are appended to the configure step (ignored when using build_script).
         """
-        repo_path = Path(repo_path).resolve()
-        if not repo_path.is_dir():
+        # One stat() up front: bail out on a missing/non-directory repo before any Path work.
+        try:
+            repo_stat = os.stat(repo_path)
+        except (OSError, ValueError):
+            return False, None, f"Not a directory: {repo_path}", None
+        if not stat.S_ISDIR(repo_stat.st_mode):
             return False, None, f"Not a directory: {repo_path}", None
+        repo_path = Path(repo_path).resolve()
 
         out_db = Path(db_path).resolve() if db_path else (repo_path / "codeql-db")
         out_db.mkdir(parents=True, exist_ok=True)
@@ -322,9 +352,7 @@ class BuildOrchestrator:
         """Write full_build_cmd to a temporary executable script; return its path."""
         fd, path = tempfile.mkstemp(prefix="futagassist_build_", suffix=".sh", dir=str(work_dir))
         try:
-            os.write(fd, b"#!/bin/sh\nset -e\n")
-            os.write(fd, full_build_cmd.encode("utf-8"))
-            os.write(fd, b"\n")
+            os.write(fd, _encoded_build_script(full_build_cmd))
         finally:
             os.close(fd)
         os.chmod(path, 0o755)
@@ -363,6 +391,10 @@ class BuildOrchestrator:
         try:
             # Send only condensed error: strip datetime/build-stdout/build-stderr, keep error lines and basic context
             error_snippet = _condense_error_for_llm(error_output, max_chars=MAX_LLM_ERROR_CHARS)
+            known_fix = _match_known_fix(error_snippet)
+            if known_fix:
+                log.info("LLM fix: known failure pattern; skipping LLM, suggestion = %s", known_fix)
+                return known_fix, None
             prompt = FIX_PROMPT.format(build_cmd=build_cmd, error_output=error_snippet)
             log.info("LLM fix: asking for fix command")
             log.debug("LLM prompt (fix):\n%s", prompt[:MAX_LOG_PROMPT_CHARS] + ("..." if len(prompt) > MAX_LOG_PROMPT_CHARS else ""))
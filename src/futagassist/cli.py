@@ -7,6 +7,7 @@ import logging
 import subprocess
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 
 import click
@@ -14,7 +15,7 @@ import click
 from futagassist import __version__
 from futagassist.core.config import ConfigManager
 from futagassist.core.health import HealthChecker
-from futagassist.core.plugin_loader import PluginLoader
+from futagassist.core.plugin_loader import PluginLoader, plugin_signature
 from futagassist.core.registry import ComponentRegistry
 from futagassist.core.schema import FunctionInfo, PipelineContext, PipelineResult, StageResult, UsageContext
 from futagassist.reporters import register_builtin_reporters
@@ -26,6 +27,29 @@ def _is_build_interactive(no_interactive: bool) -> bool:
     return sys.stdin.isatty() and not no_interactive
 
 
+@lru_cache(maxsize=8)
+def _discover_components(
+    plugins_path: Path, signature: tuple[tuple[str, int], ...]
+) -> ComponentRegistry:
+    """Build a registry with built-in stages/reporters and the plugins under plugins_path.
+
+    Cached per plugin directory and module signature, so repeated CLI invocations in one
+    process import plugins once; adding, removing or editing a plugin changes the key.
+    """
+    registry = ComponentRegistry()
+    register_builtin_stages(registry)
+    register_builtin_reporters(registry)
+    if signature:
+        loader = PluginLoader([plugins_path], registry)
+        loader.load_all()
+    return registry
+
+
+def reset_discovery() -> None:
+    """Forget cached plugin discovery results (the next command reloads plugins)."""
+    _discover_components.cache_clear()
+
+
 def _load_env_and_plugins(project_root: Path | None = None) -> tuple[ConfigManager, ComponentRegistry]:
     """Load .env and discover/load plugins; return config and registry."""
     try:
@@ -36,13 +60,10 @@ def _load_env_and_plugins(project_root: Path | None = None) -> tuple[ConfigManag
         pass
     config = ConfigManager(project_root=project_root)
     config.load()
-    registry = ComponentRegistry()
-    register_builtin_stages(registry)
-    register_builtin_reporters(registry)
     root = project_root or config.project_root
-    if (plugins_path := root / "plugins").exists():
-        loader = PluginLoader([plugins_path], registry)
-        loader.load_all()
+    plugins_path = (root / "plugins").resolve()
+    # Each command gets its own copy so registrations made by one invocation do not leak.
+    registry = _discover_components(plugins_path, plugin_signature(plugins_path)).copy()
     return config, registry
 
 
@@ -404,6 +425,24 @@ def generate(
 @click.option("--no-llm", is_flag=True, help="Disable LLM-assisted error fixing.")
 @click.option("--language", default="cpp", help="Language for compiler flags (default: cpp).")
 @click.option("--timeout", "compile_timeout", type=int, default=120, help="Compiler timeout in seconds (default: 120).")
+@click.option(
+    "--jobs",
+    "-j",
+    "compile_workers",
+    type=int,
+    default=None,
+    help="Harnesses compiled in parallel (default: CPU count).",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Recompile every harness, ignoring up-to-date binaries.",
+)
+@click.option(
+    "--pch",
+    is_flag=True,
+    help="Precompile headers shared by all harnesses once and reuse them.",
+)
 def compile(
     targets_dir: Path,
     output_dir: Path | None,
@@ -413,6 +452,9 @@ def compile(
     no_llm: bool,
     language: str,
     compile_timeout: int,
+    compile_workers: int | None,
+    force: bool,
+    pch: bool,
 ) -> None:
     """Compile fuzz harnesses into instrumented binaries."""
     config, registry = _load_env_and_plugins()
@@ -452,6 +494,9 @@ def compile(
             "compile_max_retries": max_retries,
             "compile_use_llm": not no_llm,
             "compile_timeout": compile_timeout,
+            "compile_workers": compile_workers,
+            "compile_force": force,
+            "compile_pch": pch,
         },
     )
 
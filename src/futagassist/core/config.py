@@ -105,8 +105,10 @@ class ConfigManager:
             log.warning("pyyaml not installed; skipping YAML config loading")
             return {}
         try:
-            with open(self._config_path) as f:
-                return yaml.safe_load(f) or {}
+            # libyaml-backed safe loader when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            with open(self._config_path, "rb") as f:
+                return yaml.load(f, Loader=loader) or {}
         except (OSError, PermissionError) as e:
             log.warning("Failed to read config file %s: %s", self._config_path, e)
             return {}
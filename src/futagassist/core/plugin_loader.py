@@ -26,6 +26,20 @@ def _find_plugin_modules(plugin_dir: Path) -> list[Path]:
     return modules
 
 
+def plugin_signature(plugin_dir: Path) -> tuple[tuple[str, int], ...]:
+    """Return sorted (path, mtime_ns) pairs for every .py file under plugin_dir.
+
+    Private ``_``-prefixed helpers are included because plugins import them. The
+    signature changes whenever any of these files is added, removed or modified,
+    so it can key caches of discovery results. Empty when plugin_dir does not exist.
+    """
+    if not plugin_dir.is_dir():
+        return ()
+    return tuple(
+        (str(path), path.stat().st_mtime_ns) for path in sorted(plugin_dir.rglob("*.py"))
+    )
+
+
 class PluginLoader:
     """Discovers and loads plugins from plugins/ directory."""
 
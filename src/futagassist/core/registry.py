@@ -31,6 +31,18 @@ class ComponentRegistry:
         self._llm_options: dict[str, dict[str, Any]] = {}
         self._fuzzer_options: dict[str, dict[str, Any]] = {}
 
+    def copy(self) -> ComponentRegistry:
+        """Return a new registry with the same registrations (later changes are not shared)."""
+        other = ComponentRegistry()
+        other._llm_providers = dict(self._llm_providers)
+        other._fuzzer_engines = dict(self._fuzzer_engines)
+        other._language_analyzers = dict(self._language_analyzers)
+        other._reporters = dict(self._reporters)
+        other._stages = dict(self._stages)
+        other._llm_options = {k: dict(v) for k, v in self._llm_options.items()}
+        other._fuzzer_options = {k: dict(v) for k, v in self._fuzzer_options.items()}
+        return other
+
     def register_llm(self, name: str, cls: type[LLMProvider], **options: Any) -> None:
         """Register an LLM provider class."""
         if name in self._llm_providers:
@@ -62,6 +62,9 @@ SIZE_PARAM_PATTERNS = [
     r"^cb.*",  # Windows convention: cbSize, cbData
 ]
 
+# All size patterns as one alternation so a name is matched in a single pass.
+_SIZE_PARAM_RE = re.compile("|".join(f"(?:{p})" for p in SIZE_PARAM_PATTERNS))
+
 
 def parse_parameter(param_str: str) -> ParsedParam:
     """Parse a C/C++ parameter string into ParsedParam."""
@@ -168,11 +171,7 @@ def _classify_type(base_type: str, is_pointer: bool, is_array: bool) -> ParamKin
 
 def is_size_param(name: str) -> bool:
     """Check if parameter name suggests it's a size/length parameter."""
-    name_lower = name.lower()
-    for pattern in SIZE_PARAM_PATTERNS:
-        if re.match(pattern, name_lower):
-            return True
-    return False
+    return _SIZE_PARAM_RE.match(name.lower()) is not None
 
 
 def find_buffer_size_pairs(params: list[ParsedParam]) -> list[tuple[ParsedParam, ParsedParam | None]]:
@@ -10,6 +10,12 @@ from futagassist.build.readme_analyzer import ReadmeAnalyzer
 from futagassist.core.schema import PipelineContext, StageResult
 from futagassist.utils import get_llm_provider, get_registry_and_config
 
+#: Appended to failure messages when no LLM was available for fix suggestions.
+_NO_LLM_HINT = (
+    "(No LLM configured: add an LLM plugin and set OPENAI_API_KEY or LLM_PROVIDER in .env "
+    "for automatic fix suggestions.)"
+)
+
 
 class BuildStage:
     """Pipeline stage that builds the project and creates a CodeQL database."""
@@ -101,10 +107,7 @@ class BuildStage:
 
         # Include hint when no LLM was used (no fix suggestions attempted)
         if llm is None and message:
-            message = (
-                message
-                + "\n\n(No LLM configured: add an LLM plugin and set OPENAI_API_KEY or LLM_PROVIDER in .env for automatic fix suggestions.)"
-            )
+            message = f"{message}\n\n{_NO_LLM_HINT}"
         fail_data: dict = {
             "build_log_file": str(log_file),
         }
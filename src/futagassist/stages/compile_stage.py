@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import re
+import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 
 from futagassist.core.schema import GeneratedHarness, PipelineContext, StageResult
@@ -23,15 +30,37 @@ MAX_COMPILER_ERROR_LINES = 10
 #: Upper bound (seconds) for the exponential-backoff delay between retries.
 MAX_BACKOFF_SECONDS = 30
 
+# Retry delays 1, 2, 4, ... seconds up to the cap; later retries reuse the last entry.
+_BACKOFF_SCHEDULE = tuple(
+    min(2 ** i, MAX_BACKOFF_SECONDS) for i in range(MAX_BACKOFF_SECONDS.bit_length() + 1)
+)
+
 #: Default per-harness compilation timeout (seconds).
 DEFAULT_COMPILE_TIMEOUT = 120
 
 #: Maximum characters of compiler error output sent to the LLM.
 MAX_ERROR_OUTPUT_CHARS = 4000
 
+#: Maximum characters of compiler output kept per failed attempt (the head,
+#: where the first and usually root-cause errors are).
+MAX_CAPTURED_OUTPUT_CHARS = 16 * MAX_ERROR_OUTPUT_CHARS
+
+#: Shared header precompiled when ``compile_pch`` is enabled (written to the binaries dir).
+PCH_HEADER_NAME = "fuzz_common.h"
+
 #: Maximum characters of harness source code sent to the LLM.
 MAX_SOURCE_CODE_CHARS = 8000
 
+#: Default number of harnesses compiled concurrently.
+DEFAULT_COMPILE_WORKERS = os.cpu_count() or 1
+
+#: Subdirectory of the binaries dir holding per-binary compile cache keys.
+COMPILE_CACHE_DIR = ".cache"
+
+# Serializes LLM fix requests from concurrent compile workers; providers make
+# no thread-safety promise.
+_LLM_LOCK = threading.Lock()
+
 # Default flags when no LanguageAnalyzer is available or for C/C++ harnesses.
 DEFAULT_COMPILE_FLAGS = [
     "-fsanitize=fuzzer,address",
@@ -42,6 +71,19 @@ DEFAULT_COMPILE_FLAGS = [
     "-fno-omit-frame-pointer",
 ]
 
+# Any output line mentioning "error:" (this also covers "fatal error:").
+_ERROR_LINE_RE = re.compile(r"^.*error:.*$", re.IGNORECASE | re.MULTILINE)
+
+# Characters not allowed in a binary name.
+_UNSAFE_NAME_CHAR_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+# An ``#include <...>`` / ``#include "..."`` directive at the start of a line.
+_INCLUDE_LINE_RE = re.compile(r'[ \t]*#[ \t]*include[ \t]*[<"][^>"\n]+[>"]')
+
+# First markdown code fence (at a line start) and its body; an unterminated
+# fence runs to the end of the response.
+_FENCE_RE = re.compile(r"^```[\w+-]*\n?(.*?)(?:```|\Z)", re.DOTALL | re.MULTILINE)
+
 # LLM prompt for fixing compilation errors.
 COMPILE_FIX_PROMPT = """A fuzz harness failed to compile. Suggest an edited version of the
 source that fixes the error.  Return ONLY the corrected C/C++ source
@@ -66,11 +108,107 @@ Corrected source:"""
 
 def _parse_compiler_errors(stderr: str) -> list[str]:
     """Extract short error lines from compiler output."""
-    errors: list[str] = []
-    for line in stderr.splitlines():
-        if "error:" in line.lower() or "fatal error:" in line.lower():
-            errors.append(line.strip())
-    return errors[:MAX_COMPILER_ERROR_LINES]  # cap to keep prompt short
+    # cap to keep prompt short; finditer stops scanning once the cap is reached
+    matches = islice(_ERROR_LINE_RE.finditer(stderr), MAX_COMPILER_ERROR_LINES)
+    return [m.group().strip() for m in matches]
+
+
+@lru_cache(maxsize=8)
+def _resolve_compiler(name: str) -> str:
+    """Absolute path of the compiler (looked up on PATH once), or ``name`` if not found."""
+    return shutil.which(name) or name
+
+
+def _cap_output(output: str) -> str:
+    """Keep the head of very long compiler output so failed entries stay bounded."""
+    if len(output) <= MAX_CAPTURED_OUTPUT_CHARS:
+        return output
+    dropped = len(output) - MAX_CAPTURED_OUTPUT_CHARS
+    return f"{output[:MAX_CAPTURED_OUTPUT_CHARS]}\n... [{dropped} more characters truncated]"
+
+
+def _prefix_flags(prefix: Path) -> tuple[list[str], list[str]]:
+    """Return (include_flags, lib_flags) for an install prefix's include/ and lib/ dirs."""
+    include_flags = [f"-I{prefix / 'include'}"] if (prefix / "include").is_dir() else []
+    lib = prefix / "lib"
+    lib_flags = [f"-L{lib}", f"-Wl,-rpath,{lib}"] if lib.is_dir() else []
+    return include_flags, lib_flags
+
+
+def _leading_includes(source: str) -> list[str]:
+    """``#include`` lines at the top of ``source``, before any code or other directive.
+
+    Scanning stops at the first line that is not an include, blank or comment, so
+    includes inside ``#if`` blocks or ``extern "C" { ... }``, or after a ``#define``,
+    are never hoisted into the precompiled header.
+    """
+    includes: list[str] = []
+    in_comment = False
+    for raw in source.splitlines():
+        line = raw.strip()
+        if in_comment or line.startswith("/*"):
+            end = line.find("*/", 0 if in_comment else 2)
+            in_comment = end == -1
+            if not in_comment and line[end + 2:].strip():
+                break
+            continue
+        if not line or line.startswith("//"):
+            continue
+        match = _INCLUDE_LINE_RE.match(raw)
+        if match is None:
+            break
+        includes.append(match.group().strip())
+    return includes
+
+
+def _common_includes(sources: list[str]) -> list[str]:
+    """Leading ``#include`` lines present in every source, in the order of the first one."""
+    per_source = [_leading_includes(src) for src in sources]
+    first, *rest = per_source
+    shared = set(first).intersection(*rest)
+    return [line for line in dict.fromkeys(first) if line in shared]
+
+
+def _toolchain_fingerprint(compiler: str, prefix: Path | None) -> str:
+    """Identity of the compiler binary and of every file under the prefix's include/ and lib/.
+
+    Each file contributes its path, mtime and size, so rebuilding the library
+    (``fuzz-build``) or upgrading the compiler changes the fingerprint.
+    """
+    compiler_path = os.path.realpath(_resolve_compiler(compiler))
+    paths = [compiler_path]
+    if prefix is not None:
+        for sub in ("include", "lib"):
+            for root, dirs, files in os.walk(prefix / sub):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files))
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        try:
+            st = os.stat(path)
+            digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+        except OSError:
+            digest.update(f"{path}\0missing\n".encode())
+    return digest.hexdigest()
+
+
+def _compile_cache_key(source_code: str, cmd: list[str], toolchain: str) -> str:
+    """Hash of the harness source, the full compile command and the toolchain fingerprint."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(source_code.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update("\0".join(cmd).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(toolchain.encode("ascii"))
+    return digest.hexdigest()
+
+
+def _is_up_to_date(binary_path: Path, key_path: Path, key: str) -> bool:
+    """True when the binary exists and was built from the same source and command."""
+    try:
+        return binary_path.is_file() and key_path.read_text(encoding="utf-8") == key
+    except OSError:
+        return False
 
 
 class CompileStage:
@@ -81,6 +219,8 @@ class CompileStage:
     - Linking against ``fuzz_install_prefix`` from the fuzz-build stage
     - LLM-assisted compilation error fixing with retry and exponential backoff
     - Coverage instrumentation (``-fprofile-instr-generate -fcoverage-mapping``)
+    - Incremental rebuilds: harnesses whose source, command, compiler and install
+      prefix are unchanged are skipped
     """
 
     name = "compile"
@@ -141,53 +281,54 @@ class CompileStage:
         max_retries = context.config.get("compile_max_retries", cfg.llm.max_retries)
         compiler = context.config.get("compile_compiler", "clang++")
         timeout = context.config.get("compile_timeout", DEFAULT_COMPILE_TIMEOUT)
+        force = context.config.get("compile_force", False)
 
-        # Build link flags from fuzz_install_prefix
-        link_flags: list[str] = []
+        # Build link flags from fuzz_install_prefix (computed once, shared by every harness)
+        include_flags: list[str] = []
+        lib_flags: list[str] = []
         fuzz_prefix = context.fuzz_install_prefix
-        if fuzz_prefix and Path(fuzz_prefix).is_dir():
-            p = Path(fuzz_prefix)
-            if (p / "lib").is_dir():
-                link_flags.extend([f"-L{p / 'lib'}", f"-Wl,-rpath,{p / 'lib'}"])
-            if (p / "include").is_dir():
-                link_flags.append(f"-I{p / 'include'}")
+        prefix_dir = Path(fuzz_prefix) if fuzz_prefix and Path(fuzz_prefix).is_dir() else None
+        if prefix_dir is not None:
+            include_flags, lib_flags = _prefix_flags(prefix_dir)
             log.info("Linking against fuzz install prefix: %s", fuzz_prefix)
+        link_flags = [*lib_flags, *include_flags]
+        toolchain = _toolchain_fingerprint(compiler, prefix_dir)
 
-        compiled: list[dict] = []
-        failed: list[dict] = []
-
-        for harness in valid_harnesses:
-            binary_name = _binary_name(harness)
-            binary_path = binaries_dir / binary_name
-
-            # Write source to temp file
-            source_path = binaries_dir / f"{binary_name}.cpp"
-            source_path.write_text(harness.source_code, encoding="utf-8")
-
-            success, final_binary, error_msg = self._compile_harness(
-                source_path=source_path,
-                binary_path=binary_path,
-                compiler=compiler,
-                compiler_flags=compiler_flags,
-                harness_compile_flags=harness.compile_flags,
-                link_flags=link_flags + harness.link_flags,
-                llm=llm,
-                max_retries=max_retries,
-                timeout=timeout,
-                harness=harness,
+        if context.config.get("compile_pch", False):
+            pch_path = self._build_pch(
+                valid_harnesses, binaries_dir, compiler, compiler_flags, include_flags, timeout,
+                toolchain=toolchain, force=force,
             )
-            if success:
-                compiled.append({
-                    "function_name": harness.function_name,
-                    "binary_path": str(final_binary),
-                    "source_path": str(source_path),
-                })
-            else:
-                failed.append({
-                    "function_name": harness.function_name,
-                    "source_path": str(source_path),
-                    "error": error_msg,
-                })
+            if pch_path:
+                compiler_flags = [*compiler_flags, "-include-pch", str(pch_path)]
+
+        workers = context.config.get("compile_workers") or DEFAULT_COMPILE_WORKERS
+        workers = max(1, min(workers, len(valid_harnesses)))
+        binary_names = _unique_binary_names(valid_harnesses)
+        compile_one = partial(
+            self._compile_one,
+            binaries_dir=binaries_dir,
+            compiler=compiler,
+            compiler_flags=compiler_flags,
+            link_flags=link_flags,
+            llm=llm,
+            max_retries=max_retries,
+            timeout=timeout,
+            toolchain=toolchain,
+            force=force,
+        )
+        # Each harness compiles to its own binary (names are made unique above, so
+        # no two workers share files); the compiler runs in a subprocess, so
+        # threads are enough to overlap the compiles.
+        if workers == 1:
+            outcomes = list(map(compile_one, valid_harnesses, binary_names))
+        else:
+            log.info("Compiling %d harnesses with %d workers", len(valid_harnesses), workers)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(compile_one, valid_harnesses, binary_names))
+
+        compiled = [entry for ok, entry in outcomes if ok]
+        failed = [entry for ok, entry in outcomes if not ok]
 
         total = len(valid_harnesses)
         ok_count = len(compiled)
@@ -220,28 +361,144 @@ class CompileStage:
             data=data,
         )
 
-    def _compile_harness(
+    def _build_pch(
         self,
-        source_path: Path,
-        binary_path: Path,
+        harnesses: list[GeneratedHarness],
+        binaries_dir: Path,
+        compiler: str,
+        compiler_flags: list[str],
+        include_flags: list[str],
+        timeout: int,
+        toolchain: str = "",
+        force: bool = False,
+    ) -> Path | None:
+        """Precompile the headers every harness includes. Returns the PCH path or None.
+
+        Only used when all harnesses share the same compile flags, since a PCH is
+        only valid for translation units built with matching options. Like the
+        harness binaries, the PCH is reused when its header text, command and
+        ``toolchain`` fingerprint match the last successful build, unless ``force``.
+        """
+        if len(harnesses) < 2:
+            return None
+        harness_flags = harnesses[0].compile_flags
+        if any(h.compile_flags != harness_flags for h in harnesses):
+            log.info("Harness compile flags differ; not using a precompiled header")
+            return None
+        includes = _common_includes([h.source_code for h in harnesses])
+        if not includes:
+            return None
+
+        header_path = binaries_dir / PCH_HEADER_NAME
+        header_text = "#pragma once\n" + "\n".join(includes) + "\n"
+        pch_path = header_path.with_name(f"{PCH_HEADER_NAME}.pch")
+        cmd = [
+            compiler, *compiler_flags, *harness_flags,
+            *include_flags,
+            "-x", "c++-header", str(header_path), "-o", str(pch_path),
+        ]
+        key = _compile_cache_key(header_text, cmd, toolchain)
+        key_path = binaries_dir / COMPILE_CACHE_DIR / f"{pch_path.name}.key"
+        # The header is left untouched when reused: clang rejects a PCH whose
+        # source header changed (mtime included) since it was built.
+        if not force and header_path.is_file() and _is_up_to_date(pch_path, key_path, key):
+            log.info("%s is up to date; skipping precompilation", pch_path.name)
+            return pch_path
+
+        header_path.write_text(header_text, encoding="utf-8")
+        ok, stderr = self._run_compiler(cmd, binaries_dir, timeout)
+        if not ok:
+            key_path.unlink(missing_ok=True)
+            log.warning(
+                "Precompiled header build failed; compiling without it: %s",
+                _parse_compiler_errors(stderr),
+            )
+            return None
+        key_path.parent.mkdir(exist_ok=True)
+        key_path.write_text(key, encoding="utf-8")
+        log.info("Precompiled %d shared includes into %s", len(includes), pch_path)
+        return pch_path
+
+    def _compile_one(
+        self,
+        harness: GeneratedHarness,
+        binary_name: str,
+        binaries_dir: Path,
         compiler: str,
         compiler_flags: list[str],
-        harness_compile_flags: list[str],
         link_flags: list[str],
         llm: object | None,
         max_retries: int,
         timeout: int,
+        toolchain: str = "",
+        force: bool = False,
+    ) -> tuple[bool, dict]:
+        """Write one harness source and compile it. Returns (success, result entry).
+
+        Compilation is skipped when the binary exists and its cache key (source,
+        compile command and ``toolchain`` fingerprint) matches the last successful
+        build, unless ``force``.
+        """
+        binary_path = binaries_dir / binary_name
+        source_path = binaries_dir / f"{binary_name}.cpp"
+        harness_link_flags = link_flags + harness.link_flags
+
+        cmd = self._build_compile_cmd(
+            compiler, source_path, binary_path,
+            compiler_flags, harness.compile_flags, harness_link_flags,
+        )
+        key = _compile_cache_key(harness.source_code, cmd, toolchain)
+        key_path = binaries_dir / COMPILE_CACHE_DIR / f"{binary_name}.key"
+        if not force and _is_up_to_date(binary_path, key_path, key):
+            log.info("%s is up to date; skipping compilation", binary_name)
+            return True, {
+                "function_name": harness.function_name,
+                "binary_path": str(binary_path),
+                "source_path": str(source_path),
+            }
+
+        # Write source to temp file
+        source_path.write_bytes(harness.source_code.encode("utf-8"))
+
+        success, final_binary, error_msg = self._compile_harness(
+            source_path=source_path,
+            binary_path=binary_path,
+            cmd=cmd,
+            llm=llm,
+            max_retries=max_retries,
+            timeout=timeout,
+            harness=harness,
+        )
+        if success:
+            key_path.parent.mkdir(exist_ok=True)
+            key_path.write_text(key, encoding="utf-8")
+            return True, {
+                "function_name": harness.function_name,
+                "binary_path": str(final_binary),
+                "source_path": str(source_path),
+            }
+        key_path.unlink(missing_ok=True)
+        return False, {
+            "function_name": harness.function_name,
+            "source_path": str(source_path),
+            "error": error_msg,
+        }
+
+    def _compile_harness(
+        self,
+        source_path: Path,
+        binary_path: Path,
+        cmd: list[str],
+        llm: object | None,
+        max_retries: int,
+        timeout: int,
         harness: GeneratedHarness,
     ) -> tuple[bool, Path | None, str]:
-        """Compile a single harness. Returns (success, binary_path, error_msg).
+        """Compile a single harness with ``cmd``. Returns (success, binary_path, error_msg).
 
         On failure, if an LLM is available, asks it to fix the source and retries
         with exponential backoff (1s, 2s, 4s, ...).
         """
-        cmd = self._build_compile_cmd(
-            compiler, source_path, binary_path,
-            compiler_flags, harness_compile_flags, link_flags,
-        )
         log.info("Compiling %s: %s", harness.function_name, " ".join(cmd))
 
         # First attempt
@@ -258,7 +515,7 @@ class CompileStage:
 
         current_source = harness.source_code
         for attempt in range(max_retries):
-            backoff = min(2 ** attempt, MAX_BACKOFF_SECONDS)
+            backoff = _BACKOFF_SCHEDULE[min(attempt, len(_BACKOFF_SCHEDULE) - 1)]
             log.info(
                 "Retry %d/%d for %s (backoff %ds)",
                 attempt + 1, max_retries, harness.function_name, backoff,
@@ -273,7 +530,7 @@ class CompileStage:
                 break
 
             # Write fixed source and retry compilation
-            source_path.write_text(fixed_source, encoding="utf-8")
+            source_path.write_bytes(fixed_source.encode("utf-8"))
             current_source = fixed_source
 
             ok, stderr = self._run_compiler(cmd, source_path.parent, timeout)
@@ -309,18 +566,25 @@ class CompileStage:
 
     @staticmethod
     def _run_compiler(cmd: list[str], cwd: Path, timeout: int) -> tuple[bool, str]:
-        """Run compiler and return (success, stderr)."""
+        """Run compiler and return (success, decoded stderr)."""
         try:
+            # Absolute argv[0] avoids a PATH search per exec. All fds Python opens are
+            # non-inheritable, so close_fds=False is safe and lets subprocess use the
+            # cheaper posix_spawn/vfork path even with several compiles in flight.
+            # Diagnostics go to stderr; stdout is discarded and stderr is only
+            # decoded when the compile failed.
             result = subprocess.run(
-                cmd,
+                [_resolve_compiler(cmd[0]), *cmd[1:]],
                 cwd=str(cwd),
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=timeout,
+                close_fds=False,
             )
             if result.returncode == 0:
                 return True, ""
-            return False, (result.stderr or result.stdout or f"exit code {result.returncode}").strip()
+            output = result.stderr.decode("utf-8", errors="replace").strip()
+            return False, _cap_output(output or f"exit code {result.returncode}")
         except subprocess.TimeoutExpired:
             return False, f"Compilation timed out ({timeout}s)"
         except FileNotFoundError:
@@ -344,14 +608,15 @@ class CompileStage:
             source_code=source_code[:MAX_SOURCE_CODE_CHARS],
         )
         try:
-            response = llm.complete(prompt).strip()  # type: ignore[union-attr]
+            with _LLM_LOCK:
+                response = llm.complete(prompt)  # type: ignore[union-attr]
+            response = response.strip()
             if not response or response.upper() == "UNFIXABLE":
                 return None
-            # Strip markdown fences if present
-            if response.startswith("```"):
-                response = re.sub(r"^```\w*\n?", "", response)
-            if response.endswith("```"):
-                response = response.rsplit("```", 1)[0]
+            # Keep only the first fenced block if the LLM used markdown anyway
+            fenced = _FENCE_RE.search(response)
+            if fenced:
+                response = fenced.group(1)
             response = response.strip()
             # Sanity: must contain LLVMFuzzerTestOneInput or main
             if "LLVMFuzzerTestOneInput" not in response and "int main" not in response:
@@ -372,6 +637,20 @@ class CompileStage:
 
 def _binary_name(harness: GeneratedHarness) -> str:
     """Derive a binary name from the harness function name."""
-    # Sanitize function name for filesystem
-    name = re.sub(r"[^a-zA-Z0-9_]", "_", harness.function_name)
-    return f"fuzz_{name}"
+    # Sanitize function name for filesystem (one "_" per character, so "::" -> "__")
+    return f"fuzz_{_UNSAFE_NAME_CHAR_RE.sub('_', harness.function_name)}"
+
+
+def _unique_binary_names(harnesses: list[GeneratedHarness]) -> list[str]:
+    """Binary name per harness; later harnesses whose names collide get ``_2``, ``_3``, ..."""
+    taken: set[str] = set()
+    names: list[str] = []
+    for harness in harnesses:
+        base = name = _binary_name(harness)
+        suffix = 1
+        while name in taken:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        taken.add(name)
+        names.append(name)
+    return names
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import logging
 from pathlib import Path
 
@@ -21,20 +20,20 @@ log = logging.getLogger(__name__)
 def _deduplicate_crashes(crashes: list[CrashInfo]) -> list[CrashInfo]:
     """Remove duplicate crashes based on (crash_file, crash_line, warn_class).
 
-    When those fields are empty, fall back to a hash of the backtrace.
+    When those fields are empty, fall back to the backtrace, then the summary.
+    Keys are tagged tuples kept in a set, so each crash costs one hash lookup.
     """
-    seen: set[str] = set()
+    seen: set[tuple[object, ...]] = set()
     unique: list[CrashInfo] = []
     for c in crashes:
         if c.crash_file and c.crash_line:
-            key = f"{c.crash_file}:{c.crash_line}:{c.warn_class}"
+            key: tuple[object, ...] = ("location", c.crash_file, c.crash_line, c.warn_class)
         elif c.backtrace:
-            key = hashlib.md5(c.backtrace.encode("utf-8", errors="replace")).hexdigest()
+            key = ("backtrace", c.backtrace)
         elif c.summary:
-            key = hashlib.md5(c.summary.encode("utf-8", errors="replace")).hexdigest()
+            key = ("summary", c.summary)
         else:
-            key = c.artifact_path or id(c)  # type: ignore[arg-type]
-            key = str(key)
+            key = ("artifact", c.artifact_path or id(c))
         if key not in seen:
             seen.add(key)
             unique.append(c)
@@ -38,6 +38,17 @@ def make_config_manager(tmp_path: Path) -> ConfigManager:
     return mgr
 
 
+def clone_config_manager(base: ConfigManager, tmp_path: Path) -> ConfigManager:
+    """A ConfigManager rooted at ``tmp_path`` holding a private copy of ``base``'s loaded config."""
+    mgr = ConfigManager(
+        project_root=tmp_path,
+        env_path=tmp_path / ".env",
+        config_path=tmp_path / "nonexistent.yaml",
+    )
+    mgr._config = base.config.model_copy(deep=True)
+    return mgr
+
+
 # ---------------------------------------------------------------------------
 # Mock factories
 # ---------------------------------------------------------------------------
@@ -71,6 +82,36 @@ def make_mock_config_manager() -> MagicMock:
     return cfg_mgr
 
 
+# ---------------------------------------------------------------------------
+# Component stubs
+# ---------------------------------------------------------------------------
+
+
+class MockAnalyzer:
+    """Language analyzer stub for ``cpp`` that reports a single function ``g``.
+
+    Register it directly (``registry.register_language("cpp", MockAnalyzer)``)
+    instead of writing a plugin file for the CLI to import.
+    """
+
+    language = "cpp"
+
+    def get_codeql_queries(self) -> list[Path]:
+        return []
+
+    def extract_functions(self, db_path: Path) -> list[FunctionInfo]:
+        return [FunctionInfo(name="g", signature="int g()")]
+
+    def extract_usage_contexts(self, db_path: Path) -> list:
+        return []
+
+    def generate_harness_template(self, func: FunctionInfo) -> str:
+        return ""
+
+    def get_compiler_flags(self) -> list[str]:
+        return []
+
+
 # ---------------------------------------------------------------------------
 # PipelineContext factory
 # ---------------------------------------------------------------------------
@@ -110,28 +151,33 @@ def make_pipeline_context(
 # ---------------------------------------------------------------------------
 
 
+#: Representative functions, built once at import. Treat them as read-only:
+#: ``make_sample_functions`` hands out new lists but shares these instances.
+SAMPLE_FUNCTIONS: tuple[FunctionInfo, ...] = (
+    FunctionInfo(
+        name="parse_data",
+        signature="int parse_data(const char* data, size_t size)",
+        return_type="int",
+        parameters=["const char* data", "size_t size"],
+        file_path="parser.c",
+        line=42,
+        is_api=True,
+    ),
+    FunctionInfo(
+        name="process_buffer",
+        signature="void process_buffer(uint8_t* buf, int len)",
+        return_type="void",
+        parameters=["uint8_t* buf", "int len"],
+        file_path="processor.c",
+        line=100,
+        is_fuzz_target_candidate=True,
+    ),
+)
+
+
 def make_sample_functions() -> list[FunctionInfo]:
-    """Return a small list of representative :class:`FunctionInfo` instances."""
-    return [
-        FunctionInfo(
-            name="parse_data",
-            signature="int parse_data(const char* data, size_t size)",
-            return_type="int",
-            parameters=["const char* data", "size_t size"],
-            file_path="parser.c",
-            line=42,
-            is_api=True,
-        ),
-        FunctionInfo(
-            name="process_buffer",
-            signature="void process_buffer(uint8_t* buf, int len)",
-            return_type="void",
-            parameters=["uint8_t* buf", "int len"],
-            file_path="processor.c",
-            line=100,
-            is_fuzz_target_candidate=True,
-        ),
-    ]
+    """Return a new list of the :data:`SAMPLE_FUNCTIONS` instances."""
+    return list(SAMPLE_FUNCTIONS)
 
 
 def make_sample_harness(
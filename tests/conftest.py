@@ -10,11 +10,14 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from click.testing import CliRunner
 
 from futagassist.core.config import ConfigManager
+from futagassist.core.registry import ComponentRegistry
 from futagassist.core.schema import FunctionInfo
 
 from _helpers import (  # noqa: F401 — re-export for fixture use
+    clone_config_manager,
     make_config_manager,
     make_mock_config_manager,
     make_mock_registry,
@@ -26,15 +29,79 @@ from _helpers import (  # noqa: F401 — re-export for fixture use
 )
 
 
+# ---------------------------------------------------------------------------
+# Options and markers
+# ---------------------------------------------------------------------------
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="Also run tests marked slow (e.g. CLI builds that launch CodeQL when installed).",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip ``@pytest.mark.slow`` tests unless ``--runslow`` is given."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test; use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """One CliRunner for the whole session; it keeps no state between invocations."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def minimal_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A minimal project (``pyproject.toml`` + ``README`` saying ``make``), written once.
+
+    Shared by the whole session: copy it into ``tmp_path`` rather than modifying it.
+    """
+    repo = tmp_path_factory.mktemp("minimal_repo")
+    (repo / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    (repo / "README").write_text("make")
+    return repo
+
+
+@pytest.fixture(scope="session")
+def _base_config_manager(tmp_path_factory: pytest.TempPathFactory) -> ConfigManager:
+    """Default ConfigManager loaded once per session; tests get copies via ``config_manager``."""
+    return make_config_manager(tmp_path_factory.mktemp("config"))
+
+
+@pytest.fixture()
+def config_manager(_base_config_manager: ConfigManager, tmp_path: Path) -> ConfigManager:
+    """A real ConfigManager backed by default config (no YAML/env file), private to the test."""
+    return clone_config_manager(_base_config_manager, tmp_path)
+
+
+@pytest.fixture(scope="session")
+def _builtin_registry() -> ComponentRegistry:
+    """Registry with the built-in pipeline stages, registered once per session."""
+    from futagassist.stages import register_builtin_stages
+
+    registry = ComponentRegistry()
+    register_builtin_stages(registry)
+    return registry
+
+
 @pytest.fixture()
-def config_manager(tmp_path: Path) -> ConfigManager:
-    """A real ConfigManager backed by default config (no YAML/env file)."""
-    return make_config_manager(tmp_path)
+def builtin_registry(_builtin_registry: ComponentRegistry) -> ComponentRegistry:
+    """Per-test copy of the built-in stage registry; registrations made by a test stay local."""
+    return _builtin_registry.copy()
 
 
 @pytest.fixture()
@@ -51,5 +118,5 @@ def mock_config_manager() -> MagicMock:
 
 @pytest.fixture()
 def sample_functions() -> list[FunctionInfo]:
-    """A small list of representative FunctionInfo instances."""
+    """A small list of representative FunctionInfo instances (shared; do not mutate them)."""
     return make_sample_functions()
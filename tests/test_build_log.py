@@ -44,3 +44,15 @@ def test_build_log_context_verbose_sets_debug_level(tmp_path: Path) -> None:
         log.debug("debug message")
     content = log_file.read_text(encoding="utf-8")
     assert "debug message" in content
+
+
+def test_build_log_context_closes_log_file_on_exit(tmp_path: Path) -> None:
+    """The file handler is closed, releasing the log file, when the context exits."""
+    log_file = tmp_path / "build.log"
+    with build_log_context(log_file, verbose=False) as log:
+        stream = log.handlers[-1].stream
+        log.info("attempt 1")
+        log.info("attempt 2")
+        assert not stream.closed
+    assert stream.closed
+    assert log_file.read_text(encoding="utf-8").count("attempt") == 2
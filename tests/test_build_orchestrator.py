@@ -17,6 +17,7 @@ from futagassist.build.build_orchestrator import (
     BuildOrchestrator,
     _condense_error_for_llm,
     _inject_configure_options,
+    _match_known_fix,
     _strip_log_envelope,
 )
 from futagassist.build.readme_analyzer import ReadmeAnalyzer
@@ -49,6 +50,38 @@ A fatal error occurred: Exit status 1 from command: [/path/build.sh]
     assert "checking for gcc" not in out
 
 
+def test_condense_error_for_llm_keyword_lines() -> None:
+    """Each error keyword keeps its line; lines without one are dropped."""
+    raw = "\n".join([
+        "checking for zlib... yes",
+        "foo.c:(.text+0x1): undefined reference to `bar'",
+        "make: *** No rule to make target 'all'.",
+        "ld: cannot find -lpsl",
+        "Compilation Failed",
+        "header file missing",
+        "compiling foo.c",
+    ])
+    out = _condense_error_for_llm(raw, max_chars=2000).splitlines()
+    assert out == [
+        "foo.c:(.text+0x1): undefined reference to `bar'",
+        "make: *** No rule to make target 'all'.",
+        "ld: cannot find -lpsl",
+        "Compilation Failed",
+        "header file missing",
+    ]
+
+
+def test_condense_error_for_llm_keeps_tail_within_budget() -> None:
+    """A log longer than max_chars is cut to its last max_chars characters with a note."""
+    raw = "A fatal error occurred: Exit status 2\n" + "\n".join(f"error {i}" for i in range(10000))
+    out = _condense_error_for_llm(raw, max_chars=50)
+    header, body = out.split("\n", 1)
+    assert header == "(output truncated; showing last 50 chars)"
+    assert len(body) == 50
+    assert body.endswith("error 9999")
+    assert "Build failed" not in out
+
+
 def test_inject_configure_options_append_to_configure_step() -> None:
     """_inject_configure_options appends options to the first ./configure step."""
     commands = ["./buildconf", "./configure", "make"]
@@ -85,9 +118,7 @@ def test_build_orchestrator_write_build_script_creates_executable(tmp_path: Path
     orch = BuildOrchestrator(readme_analyzer=analyzer, codeql_bin="codeql")
     script_path = orch._write_build_script(tmp_path, "cd /x && make")
     assert Path(script_path).exists()
-    content = Path(script_path).read_text()
-    assert content.startswith("#!/bin/sh")
-    assert "cd /x && make" in content
+    assert Path(script_path).read_bytes() == b"#!/bin/sh\nset -e\ncd /x && make\n"
     assert Path(script_path).stat().st_mode & 0o111
     Path(script_path).unlink(missing_ok=True)
 
@@ -175,6 +206,30 @@ def test_build_orchestrator_ask_llm_for_fix_none_returns_none() -> None:
     assert fix is None and err is None
 
 
+def test_match_known_fix() -> None:
+    """_match_known_fix maps common autotools / missing-library errors to a fix command."""
+    assert _match_known_fix("configure.ac:10: error: possibly undefined macro: LT_PATH_LD") == (
+        "libtoolize && autoreconf -fi"
+    )
+    assert _match_known_fix(
+        "configure: error: libpsl libs and/or directories were not found where specified!"
+    ) == "apt-get install -y libpsl-dev"
+    assert _match_known_fix("foo.c:1: error: expected ';'") is None
+
+
+def test_build_orchestrator_ask_llm_for_fix_known_pattern_skips_llm() -> None:
+    """_ask_llm_for_fix returns the table fix without calling the LLM for a known error."""
+    class MockLLM:
+        name = "mock"
+        def complete(self, prompt: str, **kwargs):
+            raise AssertionError("LLM should not be called for a known failure pattern")
+
+    analyzer = ReadmeAnalyzer(llm_provider=None)
+    orch = BuildOrchestrator(readme_analyzer=analyzer, llm_provider=MockLLM())
+    fix, err = orch._ask_llm_for_fix("make", "LT_PATH_LD: command not found")
+    assert fix == "libtoolize && autoreconf -fi" and err is None
+
+
 def test_build_orchestrator_run_fix_command_success(tmp_path: Path) -> None:
     """_run_fix_command returns True when command exits 0."""
     analyzer = ReadmeAnalyzer(llm_provider=None)
@@ -230,6 +285,20 @@ def test_build_orchestrator_nonexistent_repo() -> None:
     assert "Not a directory" in message or "nonexistent" in message.lower()
 
 
+def test_build_orchestrator_repo_is_file(tmp_path: Path) -> None:
+    """A repo path that exists but is a regular file returns failure without building."""
+    not_a_dir = tmp_path / "README"
+    not_a_dir.write_text("make")
+    analyzer = ReadmeAnalyzer(llm_provider=None)
+    orch = BuildOrchestrator(readme_analyzer=analyzer, codeql_bin="codeql")
+    success, db_path, message, suggested_fix = orch.build(not_a_dir)
+    assert success is False
+    assert db_path is None
+    assert suggested_fix is None
+    assert "Not a directory" in message
+    assert not (tmp_path / "codeql-db").exists()
+
+
 def test_build_orchestrator_codeql_not_found(tmp_path: Path) -> None:
     """When codeql binary is not found, build fails with clear message."""
     (tmp_path / "README").write_text("make")
@@ -2,31 +2,74 @@
 
 from __future__ import annotations
 
+import os
+import shutil
+from collections.abc import Iterator
+from contextlib import ExitStack, chdir
+from dataclasses import dataclass
 from pathlib import Path
 from unittest.mock import patch
 
+import click
 import pytest
 from click.testing import CliRunner
 
-from futagassist.cli import main
+from _helpers import MockAnalyzer
+from futagassist.cli import main, reset_discovery
+from futagassist.core.plugin_loader import PluginLoader
+from futagassist.core.registry import ComponentRegistry
 from futagassist.core.schema import StageResult
+from futagassist.reporters import register_builtin_reporters
+from futagassist.stages import register_builtin_stages
 
 
-@pytest.fixture
-def runner() -> CliRunner:
-    return CliRunner()
+@dataclass(frozen=True, slots=True)
+class _FakeProc:
+    """Stand-in for the ``subprocess.CompletedProcess`` returned by a patched ``subprocess.run``."""
 
+    returncode: int = 0
+    stdout: str = ""
+    stderr: str = ""
 
-def test_cli_version(runner: CliRunner) -> None:
-    result = runner.invoke(main, ["--version"])
-    assert result.exit_code == 0
-    assert "0.1.0" in result.output
+
+@pytest.fixture(autouse=True)
+def _restore_environ() -> Iterator[None]:
+    """Undo process-wide changes a command makes (``load_dotenv`` writes to ``os.environ``).
+
+    Keeps each test independent of the ones run before it on the same xdist worker.
+    """
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.fixture()
+def cli_registry() -> Iterator[ComponentRegistry]:
+    """Registry handed to CLI commands instead of plugin discovery; tests register mocks on it."""
+    registry = ComponentRegistry()
+    register_builtin_stages(registry)
+    register_builtin_reporters(registry)
+    with patch("futagassist.cli._discover_components", return_value=registry):
+        yield registry
+
+
+def _option(command: str, name: str) -> click.Option:
+    """Return the option called ``name`` on subcommand ``command`` (no invocation)."""
+    (option,) = [p for p in main.commands[command].params if p.name == name]
+    return option
+
+
+def test_cli_version(capsys: pytest.CaptureFixture[str]) -> None:
+    exit_code = main.main(["--version"], prog_name="futagassist", standalone_mode=False)
+    assert exit_code == 0
+    assert "0.1.0" in capsys.readouterr().out
 
 
 def test_cli_plugins_list_empty(runner: CliRunner, tmp_path: Path) -> None:
     """Without plugins/ directory, list shows (none) for all."""
-    with runner.isolated_filesystem(temp_dir=tmp_path):
-        result = runner.invoke(main, ["plugins", "list"])
+    with chdir(tmp_path):
+        result = runner.invoke(main, ["plugins", "list"], standalone_mode=False)
         assert result.exit_code == 0
         assert "Available components" in result.output
         assert "Llm" in result.output or "Providers" in result.output
@@ -42,42 +85,61 @@ def register(registry):
     registry.register_llm("openai", _MockLLM)
 """)
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'futagassist'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
-        result = runner.invoke(main, ["plugins", "list"], catch_exceptions=False)
+    with chdir(tmp_path):
+        result = runner.invoke(
+            main, ["plugins", "list"], standalone_mode=False, catch_exceptions=False
+        )
         assert result.exit_code == 0
-        # Plugin dir is relative to cwd; cwd in isolated_filesystem is tmp_path
+        # Plugin dir is relative to cwd; cwd is tmp_path
         assert "openai" in result.output or "(none)" in result.output
 
 
-def test_cli_check_exits_nonzero_when_fail(runner: CliRunner, tmp_path: Path) -> None:
-    """check command runs; exits 1 when codeql or plugins check fails, 0 when all pass."""
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
-        result = runner.invoke(
-            main,
-            ["check", "--skip-llm", "--skip-fuzzer", "--skip-plugins"],
-            catch_exceptions=False,
-        )
-        assert result.exit_code in (0, 1)
-        assert "codeql" in result.output.lower()
+def test_cli_plugin_discovery_cached_between_invocations(runner: CliRunner, tmp_path: Path) -> None:
+    """Plugins are imported once for repeated commands, and again after reset_discovery()."""
+    plugins_dir = tmp_path / "plugins" / "llm"
+    plugins_dir.mkdir(parents=True)
+    (plugins_dir / "openai_provider.py").write_text("""
+def register(registry):
+    from tests.test_registry import _MockLLM
+    registry.register_llm("openai", _MockLLM)
+""")
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'futagassist'\n")
+    reset_discovery()
+    with chdir(tmp_path), patch(
+        "futagassist.cli.PluginLoader.load_all", autospec=True, side_effect=PluginLoader.load_all
+    ) as load_all:
+        for _ in range(2):
+            result = runner.invoke(
+                main, ["plugins", "list"], standalone_mode=False, catch_exceptions=False
+            )
+            assert "openai" in result.output
+        assert load_all.call_count == 1
+        reset_discovery()
+        runner.invoke(main, ["plugins", "list"], standalone_mode=False, catch_exceptions=False)
+        assert load_all.call_count == 2
+
 
+@pytest.mark.parametrize("extra_args", [[], ["-v"]], ids=["default", "verbose"])
+def test_cli_check_skip_options(runner: CliRunner, tmp_path: Path, extra_args: list[str]) -> None:
+    """check with --skip-llm, --skip-fuzzer, --skip-plugins runs only the codeql check.
 
-def test_cli_check_skip_options(runner: CliRunner, tmp_path: Path) -> None:
-    """check with --skip-llm, --skip-fuzzer, --skip-plugins runs only codeql check."""
+    Exits 1 when the codeql check fails, 0 when it passes.
+    """
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
-            ["check", "--skip-llm", "--skip-fuzzer", "--skip-plugins", "-v"],
+            ["check", "--skip-llm", "--skip-fuzzer", "--skip-plugins", *extra_args],
+            standalone_mode=False,
             catch_exceptions=False,
         )
+        assert result.exit_code in (0, 1)
         assert "codeql" in result.output.lower()
 
 
-def test_cli_build_requires_repo(runner: CliRunner) -> None:
+def test_cli_build_requires_repo() -> None:
     """build command requires --repo."""
-    result = runner.invoke(main, ["build"], catch_exceptions=False)
-    assert result.exit_code != 0
+    assert _option("build", "repo_path").required is True
 
 
 def test_cli_build_nonexistent_repo(runner: CliRunner) -> None:
@@ -90,11 +152,11 @@ def test_cli_build_nonexistent_repo(runner: CliRunner) -> None:
     assert result.exit_code != 0
 
 
-def test_cli_build_with_repo(runner: CliRunner, tmp_path: Path) -> None:
+@pytest.mark.slow
+def test_cli_build_with_repo(runner: CliRunner, tmp_path: Path, minimal_repo: Path) -> None:
     """build with valid repo path runs (may fail on codeql but command is accepted)."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             ["build", "--repo", str(tmp_path)],
@@ -113,12 +175,12 @@ def test_cli_build_with_repo(runner: CliRunner, tmp_path: Path) -> None:
             )
 
 
-def test_cli_build_with_log_file(runner: CliRunner, tmp_path: Path) -> None:
+@pytest.mark.slow
+def test_cli_build_with_log_file(runner: CliRunner, tmp_path: Path, minimal_repo: Path) -> None:
     """build with --log-file writes log to the given path."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
     custom_log = tmp_path / "my-build.log"
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             ["build", "--repo", str(tmp_path), "--log-file", str(custom_log)],
@@ -130,31 +192,28 @@ def test_cli_build_with_log_file(runner: CliRunner, tmp_path: Path) -> None:
         assert "Build stage" in content or "repo_path" in content or "CodeQL" in content
 
 
-def test_cli_build_accepts_verbose(runner: CliRunner, tmp_path: Path) -> None:
+@pytest.mark.slow
+@pytest.mark.parametrize("flag", ["--verbose", "-v"])
+def test_cli_build_accepts_verbose(
+    runner: CliRunner, tmp_path: Path, minimal_repo: Path, flag: str
+) -> None:
     """build with --verbose / -v is accepted (no option error)."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
-            ["build", "--repo", str(tmp_path), "--verbose"],
+            ["build", "--repo", str(tmp_path), flag],
             catch_exceptions=False,
         )
         assert result.exit_code in (0, 1)
-    with runner.isolated_filesystem(temp_dir=tmp_path):
-        result_v = runner.invoke(
-            main,
-            ["build", "--repo", str(tmp_path), "-v"],
-            catch_exceptions=False,
-        )
-        assert result_v.exit_code in (0, 1)
 
 
+@pytest.mark.slow
 def test_cli_build_accepts_build_script(runner: CliRunner, tmp_path: Path) -> None:
     """build with --build-script is accepted; script path relative to repo."""
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
     (tmp_path / "mybuild.sh").write_text("#!/bin/sh\nexit 0")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             ["build", "--repo", str(tmp_path), "--build-script", "mybuild.sh"],
@@ -166,10 +225,11 @@ def test_cli_build_accepts_build_script(runner: CliRunner, tmp_path: Path) -> No
             assert "not found" in result.output.lower() or "Build script" in result.output
 
 
-def test_cli_build_configure_options_passed_to_context(runner: CliRunner, tmp_path: Path) -> None:
+def test_cli_build_configure_options_passed_to_context(
+    runner: CliRunner, tmp_path: Path, minimal_repo: Path
+) -> None:
     """build with --configure-options passes build_configure_options to stage context."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
     captured_ctx = []
 
     def capture_and_succeed(ctx):
@@ -181,10 +241,11 @@ def test_cli_build_configure_options_passed_to_context(runner: CliRunner, tmp_pa
         )
 
     with patch("futagassist.stages.build_stage.BuildStage.execute", side_effect=capture_and_succeed):
-        with runner.isolated_filesystem(temp_dir=tmp_path):
+        with chdir(tmp_path):
             result = runner.invoke(
                 main,
                 ["build", "--repo", str(tmp_path), "--configure-options", "--without-ssl", "--no-interactive"],
+                standalone_mode=False,
                 catch_exceptions=False,
             )
     assert result.exit_code == 0
@@ -193,11 +254,10 @@ def test_cli_build_configure_options_passed_to_context(runner: CliRunner, tmp_pa
 
 
 def test_cli_build_no_interactive_exits_without_prompt_on_suggested_fix(
-    runner: CliRunner, tmp_path: Path
+    runner: CliRunner, tmp_path: Path, minimal_repo: Path
 ) -> None:
     """With --no-interactive and a suggested fix, build exits 1 without prompting."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
     fail_result = StageResult(
         stage_name="build",
         success=False,
@@ -208,10 +268,11 @@ def test_cli_build_no_interactive_exits_without_prompt_on_suggested_fix(
         },
     )
     with patch("futagassist.stages.build_stage.BuildStage.execute", return_value=fail_result):
-        with runner.isolated_filesystem(temp_dir=tmp_path):
+        with chdir(tmp_path):
             result = runner.invoke(
                 main,
                 ["build", "--repo", str(tmp_path), "--no-interactive"],
+                standalone_mode=False,
                 catch_exceptions=False,
             )
     assert result.exit_code == 1
@@ -220,10 +281,11 @@ def test_cli_build_no_interactive_exits_without_prompt_on_suggested_fix(
     assert "Run this fix" not in result.output or "--no-interactive" in result.output
 
 
-def test_cli_build_interactive_accept_fix_retries(runner: CliRunner, tmp_path: Path) -> None:
+def test_cli_build_interactive_accept_fix_retries(
+    runner: CliRunner, tmp_path: Path, minimal_repo: Path
+) -> None:
     """When interactive and user accepts, fix is run and build is retried; success on retry."""
-    (tmp_path / "README").write_text("make")
-    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    shutil.copytree(minimal_repo, tmp_path, dirs_exist_ok=True)
     fail_result = StageResult(
         stage_name="build",
         success=False,
@@ -246,48 +308,54 @@ def test_cli_build_interactive_accept_fix_retries(runner: CliRunner, tmp_path: P
         call_count += 1
         return fail_result if call_count == 1 else success_result
 
-    with patch("futagassist.stages.build_stage.BuildStage.execute", side_effect=mock_execute):
-        with patch("futagassist.cli._is_build_interactive", return_value=True):
-            with patch("futagassist.cli.click.prompt", return_value=""):  # skip configure-options retry
-                with patch("futagassist.cli.click.confirm", return_value=True):
-                    with patch("futagassist.cli.subprocess.run") as mock_run:
-                        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
-                        with runner.isolated_filesystem(temp_dir=tmp_path):
-                            result = runner.invoke(
-                                main,
-                                ["build", "--repo", str(tmp_path)],
-                                catch_exceptions=False,
-                            )
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch("futagassist.stages.build_stage.BuildStage.execute", side_effect=mock_execute)
+        )
+        stack.enter_context(patch("futagassist.cli._is_build_interactive", return_value=True))
+        # Empty prompt answer skips the configure-options retry.
+        stack.enter_context(patch("futagassist.cli.click.prompt", return_value=""))
+        stack.enter_context(patch("futagassist.cli.click.confirm", return_value=True))
+        mock_run = stack.enter_context(patch("futagassist.cli.subprocess.run"))
+        mock_run.return_value = _FakeProc()
+        stack.enter_context(chdir(tmp_path))
+        result = runner.invoke(
+            main,
+            ["build", "--repo", str(tmp_path)],
+            standalone_mode=False,
+            catch_exceptions=False,
+        )
     assert result.exit_code == 0, result.output
     assert "CodeQL database" in result.output
     assert call_count == 2
     mock_run.assert_called_once()
 
 
-def test_cli_fuzz_build_requires_repo(runner: CliRunner) -> None:
+def test_cli_fuzz_build_requires_repo() -> None:
     """fuzz-build command requires --repo."""
-    result = runner.invoke(main, ["fuzz-build"], catch_exceptions=False)
-    assert result.exit_code != 0
+    assert _option("fuzz-build", "repo_path").required is True
 
 
-def test_cli_fuzz_build_help(runner: CliRunner) -> None:
+def test_cli_fuzz_build_help(capsys: pytest.CaptureFixture[str]) -> None:
     """fuzz-build --help shows options."""
-    result = runner.invoke(main, ["fuzz-build", "--help"], catch_exceptions=False)
-    assert result.exit_code == 0
-    assert "fuzz-build" in result.output or "fuzz" in result.output
-    assert "--repo" in result.output
-    assert "sanitizer" in result.output.lower() or "install" in result.output.lower()
+    exit_code = main.main(["fuzz-build", "--help"], prog_name="futagassist", standalone_mode=False)
+    assert exit_code == 0
+    output = capsys.readouterr().out
+    assert "fuzz-build" in output or "fuzz" in output
+    assert "--repo" in output
+    assert "sanitizer" in output.lower() or "install" in output.lower()
 
 
 def test_cli_fuzz_build_success_with_mock(runner: CliRunner, tmp_path: Path) -> None:
     """fuzz-build with --repo runs FuzzBuildStage; success prints fuzz_install_prefix."""
     (tmp_path / "README").write_text("make")
     with patch("futagassist.stages.fuzz_build_stage.subprocess.run") as m:
-        m.return_value = type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
-        with runner.isolated_filesystem(temp_dir=tmp_path):
+        m.return_value = _FakeProc()
+        with chdir(tmp_path):
             result = runner.invoke(
                 main,
                 ["fuzz-build", "--repo", str(tmp_path)],
+                standalone_mode=False,
                 catch_exceptions=False,
             )
     assert result.exit_code == 0
@@ -295,54 +363,38 @@ def test_cli_fuzz_build_success_with_mock(runner: CliRunner, tmp_path: Path) ->
     assert "install-fuzz" in result.output or "Instrumented install" in result.output
 
 
-def test_cli_analyze_requires_db(runner: CliRunner) -> None:
+def test_cli_analyze_requires_db() -> None:
     """analyze command requires --db."""
-    result = runner.invoke(main, ["analyze"], catch_exceptions=False)
-    assert result.exit_code != 0
+    assert _option("analyze", "db_path").required is True
 
 
 def test_cli_analyze_no_language_analyzer_fails(runner: CliRunner, tmp_path: Path) -> None:
     """analyze with valid db but no language analyzer registered exits 1."""
     (tmp_path / "codeql-db").mkdir()
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             ["analyze", "--db", str(tmp_path / "codeql-db")],
+            standalone_mode=False,
             catch_exceptions=False,
         )
     assert result.exit_code == 1
     assert "language" in result.output.lower() or "analyzer" in result.output.lower()
 
 
-def test_cli_analyze_with_plugin_succeeds(runner: CliRunner, tmp_path: Path) -> None:
-    """analyze with plugin that registers a language analyzer succeeds and prints function count."""
+def test_cli_analyze_with_plugin_succeeds(
+    runner: CliRunner, tmp_path: Path, cli_registry: ComponentRegistry
+) -> None:
+    """analyze with a registered language analyzer succeeds and prints function count."""
     (tmp_path / "codeql-db").mkdir()
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
-    plugins_dir = tmp_path / "plugins" / "languages"
-    plugins_dir.mkdir(parents=True)
-    (plugins_dir / "mock_analyzer.py").write_text("""
-from pathlib import Path
-from futagassist.core.schema import FunctionInfo
-
-class MockAnalyzer:
-    language = "cpp"
-    def get_codeql_queries(self): return []
-    def extract_functions(self, db_path):
-        return [
-            FunctionInfo(name="f", signature="void f()"),
-        ]
-    def extract_usage_contexts(self, db_path): return []
-    def generate_harness_template(self, func): return ""
-    def get_compiler_flags(self): return []
-
-def register(registry):
-    registry.register_language("cpp", MockAnalyzer)
-""")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    cli_registry.register_language("cpp", MockAnalyzer)
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             ["analyze", "--db", str(tmp_path / "codeql-db"), "--language", "cpp"],
+            standalone_mode=False,
             catch_exceptions=False,
         )
     assert result.exit_code == 0, result.output
@@ -350,28 +402,15 @@ def register(registry):
     assert "function" in result.output.lower()
 
 
-def test_cli_analyze_with_output_writes_json(runner: CliRunner, tmp_path: Path) -> None:
+def test_cli_analyze_with_output_writes_json(
+    runner: CliRunner, tmp_path: Path, cli_registry: ComponentRegistry
+) -> None:
     """analyze --output writes JSON file."""
     (tmp_path / "codeql-db").mkdir()
     (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
     out_json = tmp_path / "out" / "functions.json"
-    plugins_dir = tmp_path / "plugins" / "languages"
-    plugins_dir.mkdir(parents=True)
-    (plugins_dir / "mock_analyzer.py").write_text("""
-from futagassist.core.schema import FunctionInfo
-
-class MockAnalyzer:
-    language = "cpp"
-    def get_codeql_queries(self): return []
-    def extract_functions(self, db_path): return [FunctionInfo(name="g", signature="int g()")]
-    def extract_usage_contexts(self, db_path): return []
-    def generate_harness_template(self, func): return ""
-    def get_compiler_flags(self): return []
-
-def register(registry):
-    registry.register_language("cpp", MockAnalyzer)
-""")
-    with runner.isolated_filesystem(temp_dir=tmp_path):
+    cli_registry.register_language("cpp", MockAnalyzer)
+    with chdir(tmp_path):
         result = runner.invoke(
             main,
             [
@@ -380,6 +419,7 @@ def register(registry):
                 "--output", str(out_json),
                 "--language", "cpp",
             ],
+            standalone_mode=False,
             catch_exceptions=False,
         )
     assert result.exit_code == 0
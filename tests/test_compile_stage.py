@@ -16,12 +16,17 @@ from futagassist.stages.compile_stage import (
     DEFAULT_COMPILE_FLAGS,
     DEFAULT_COMPILE_TIMEOUT,
     MAX_BACKOFF_SECONDS,
+    MAX_CAPTURED_OUTPUT_CHARS,
     MAX_COMPILER_ERROR_LINES,
     MAX_ERROR_OUTPUT_CHARS,
     MAX_SOURCE_CODE_CHARS,
     CompileStage,
+    _BACKOFF_SCHEDULE,
     _binary_name,
+    _common_includes,
     _parse_compiler_errors,
+    _prefix_flags,
+    _resolve_compiler,
 )
 
 
@@ -165,7 +170,7 @@ class TestCompileStageExecution:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is True
@@ -182,7 +187,7 @@ class TestCompileStageExecution:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stderr="error: undeclared", stdout="")
+            mock_run.return_value = MagicMock(returncode=1, stderr=b"error: undeclared", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is False
@@ -205,8 +210,8 @@ class TestCompileStageExecution:
             call_count += 1
             # First call succeeds, second fails
             if call_count == 1:
-                return MagicMock(returncode=0, stderr="", stdout="")
-            return MagicMock(returncode=1, stderr="error: bad", stdout="")
+                return MagicMock(returncode=0, stderr=b"", stdout="")
+            return MagicMock(returncode=1, stderr=b"error: bad", stdout="")
 
         with patch("subprocess.run", side_effect=side_effect):
             result = stage.execute(ctx)
@@ -225,7 +230,7 @@ class TestCompileStageExecution:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is True
@@ -242,12 +247,33 @@ class TestCompileStageExecution:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is True
         call_args = mock_run.call_args[0][0]
-        assert call_args[0] == "g++"
+        assert Path(call_args[0]).name == "g++"
+
+    def test_compiler_resolved_on_path(self, tmp_path: Path) -> None:
+        """The compiler is run by its absolute PATH location, looked up once."""
+        _resolve_compiler.cache_clear()
+        ctx = _make_context(
+            tmp_path,
+            harnesses=[_make_harness("a"), _make_harness("b")],
+            extra_config={
+                "compile_compiler": "my-clang++",
+                "compile_use_llm": False,
+                "compile_workers": 1,
+            },
+        )
+        ok = MagicMock(returncode=0, stderr=b"", stdout="")
+        with patch("shutil.which", return_value="/opt/llvm/bin/my-clang++") as mock_which, \
+             patch("subprocess.run", return_value=ok) as mock_run:
+            CompileStage().execute(ctx)
+        _resolve_compiler.cache_clear()
+
+        assert {c.args[0][0] for c in mock_run.call_args_list} == {"/opt/llvm/bin/my-clang++"}
+        mock_which.assert_called_once_with("my-clang++")
 
     def test_compile_compiler_not_found(self, tmp_path: Path) -> None:
         """When compiler binary is not found, compilation fails gracefully."""
@@ -282,6 +308,209 @@ class TestCompileStageExecution:
         assert result.success is False
         assert result.data["failed_count"] == 1
 
+    def test_compile_parallel_keeps_harness_order(self, tmp_path: Path) -> None:
+        """With several workers, results are still reported in harness order."""
+        names = [f"f{i}" for i in range(6)]
+        ctx = _make_context(
+            tmp_path,
+            harnesses=[_make_harness(n) for n in names],
+            extra_config={"compile_use_llm": False, "compile_workers": 4},
+        )
+
+        def side_effect(cmd, **kwargs):
+            failing = any(arg.endswith(("fuzz_f1.cpp", "fuzz_f4.cpp")) for arg in cmd)
+            return MagicMock(returncode=1 if failing else 0, stderr=b"error: bad", stdout="")
+
+        stage = CompileStage()
+        with patch("subprocess.run", side_effect=side_effect) as mock_run:
+            result = stage.execute(ctx)
+
+        assert mock_run.call_count == 6
+        assert [c["function_name"] for c in result.data["compiled"]] == ["f0", "f2", "f3", "f5"]
+        assert [f["function_name"] for f in result.data["failed"]] == ["f1", "f4"]
+
+    def test_colliding_binary_names_are_made_unique(self, tmp_path: Path) -> None:
+        """Harnesses that sanitize to the same binary name never share output files."""
+        ctx = _make_context(
+            tmp_path,
+            harnesses=[_make_harness(n) for n in ("a::b", "a__b", "a__b")],
+            extra_config={"compile_use_llm": False, "compile_workers": 4},
+        )
+
+        stage = CompileStage()
+        with patch("subprocess.run", return_value=MagicMock(returncode=0, stderr=b"", stdout="")):
+            result = stage.execute(ctx)
+
+        names = [Path(c["binary_path"]).name for c in result.data["compiled"]]
+        assert names == ["fuzz_a__b", "fuzz_a__b_2", "fuzz_a__b_3"]
+        sources = [Path(c["source_path"]).name for c in result.data["compiled"]]
+        assert sources == [f"{n}.cpp" for n in names]
+
+    def test_unchanged_harness_is_not_recompiled(self, tmp_path: Path) -> None:
+        """A second run with the same source and command reuses the existing binary."""
+        out = tmp_path / "out"
+
+        def fake_compile(cmd, **kwargs):
+            Path(cmd[cmd.index("-o") + 1]).write_text("binary")
+            return MagicMock(returncode=0, stderr=b"", stdout="")
+
+        stage = CompileStage()
+        with patch("subprocess.run", side_effect=fake_compile) as mock_run:
+            for _ in range(2):
+                ctx = _make_context(
+                    tmp_path,
+                    harnesses=[_make_harness("f")],
+                    extra_config={"compile_output": str(out), "compile_use_llm": False},
+                )
+                result = stage.execute(ctx)
+                assert result.data["compiled_count"] == 1
+
+        assert mock_run.call_count == 1
+        assert (out / ".cache" / "fuzz_f.key").is_file()
+
+    @pytest.mark.parametrize("change", ["source", "flags", "force", "library", "compiler"])
+    def test_changed_harness_is_recompiled(self, tmp_path: Path, change: str) -> None:
+        """A new source, compile command, library build or compiler invalidates the cache."""
+        out = tmp_path / "out"
+        prefix = tmp_path / "prefix"
+        (prefix / "lib").mkdir(parents=True)
+        (prefix / "lib" / "libfoo.a").write_text("v1")
+        compiler = tmp_path / "clang++"
+        compiler.write_text("v1")
+
+        def fake_compile(cmd, **kwargs):
+            Path(cmd[cmd.index("-o") + 1]).write_text("binary")
+            return MagicMock(returncode=0, stderr=b"", stdout="")
+
+        first = _make_harness("f")
+        second = _make_harness("f")
+        extra: dict = {
+            "compile_output": str(out),
+            "compile_use_llm": False,
+            "compile_compiler": str(compiler),
+        }
+        if change == "source":
+            second.source_code += "// edited\n"
+        elif change == "flags":
+            second.compile_flags = ["-DEXTRA"]
+
+        stage = CompileStage()
+        with patch("subprocess.run", side_effect=fake_compile) as mock_run:
+            stage.execute(
+                _make_context(tmp_path, harnesses=[first], fuzz_prefix=prefix, extra_config=extra)
+            )
+            if change == "force":
+                extra["compile_force"] = True
+            elif change == "library":
+                (prefix / "lib" / "libfoo.a").write_text("v2, rebuilt")
+            elif change == "compiler":
+                compiler.write_text("v2, upgraded")
+            stage.execute(
+                _make_context(tmp_path, harnesses=[second], fuzz_prefix=prefix, extra_config=extra)
+            )
+
+        assert mock_run.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# CompileStage: precompiled header
+# ---------------------------------------------------------------------------
+
+
+class TestCompileStagePCH:
+    def test_common_includes_keeps_shared_lines_in_order(self) -> None:
+        sources = [
+            "#include <stdint.h>\n#include \"lib.h\"\n#include <string.h>\n",
+            "#include <string.h>\n  #include <stdint.h>\n#include \"lib.h\"\n",
+            "#include <stdint.h>\n#include <string.h>\n#include \"lib.h\"\n#include <vector>\n",
+        ]
+        assert _common_includes(sources) == [
+            "#include <stdint.h>",
+            "#include \"lib.h\"",
+            "#include <string.h>",
+        ]
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            '#include <stdint.h>\nextern "C" {\n#include "lib.h"\n}\n',
+            '#include <stdint.h>\n#ifdef HAVE_LIB\n#include "lib.h"\n#endif\n',
+            '#include <stdint.h>\n#define LIB_API\n#include "lib.h"\n',
+        ],
+        ids=["extern_c", "ifdef", "after_define"],
+    )
+    def test_common_includes_only_hoists_top_level_includes(self, source: str) -> None:
+        """Includes after a conditional, extern block or other directive stay in the harness."""
+        assert _common_includes([source, source]) == ["#include <stdint.h>"]
+
+    def test_common_includes_skips_leading_comments(self) -> None:
+        source = '/* harness\n * for lib\n */\n// generated\n\n#include "lib.h"\nint x;\n'
+        assert _common_includes([source, source]) == ['#include "lib.h"']
+
+    def test_pch_built_once_and_used_for_every_harness(self, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        ctx = _make_context(
+            tmp_path,
+            harnesses=[_make_harness("a"), _make_harness("b")],
+            extra_config={
+                "compile_pch": True,
+                "compile_use_llm": False,
+                "compile_output": str(out),
+            },
+        )
+        ok = MagicMock(returncode=0, stderr=b"", stdout="")
+        with patch("subprocess.run", return_value=ok) as mock_run:
+            result = CompileStage().execute(ctx)
+
+        assert result.data["compiled_count"] == 2
+        cmds = [c.args[0] for c in mock_run.call_args_list]
+        pch_cmds = [cmd for cmd in cmds if "c++-header" in cmd]
+        assert len(pch_cmds) == 1
+        pch = str(out / "fuzz_common.h.pch")
+        assert all(pch in cmd for cmd in cmds if cmd not in pch_cmds)
+        assert (out / "fuzz_common.h").read_text() == "#pragma once\n#include <stdint.h>\n"
+
+    def test_pch_reused_when_every_harness_is_up_to_date(self, tmp_path: Path) -> None:
+        """A rerun with nothing changed runs no compiler, not even for the header."""
+        out = tmp_path / "out"
+        extra = {"compile_pch": True, "compile_use_llm": False, "compile_output": str(out)}
+
+        def fake_compile(cmd, **kwargs):
+            Path(cmd[cmd.index("-o") + 1]).write_text("built")
+            return MagicMock(returncode=0, stderr=b"", stdout="")
+
+        stage = CompileStage()
+        with patch("subprocess.run", side_effect=fake_compile) as mock_run:
+            for _ in range(2):
+                result = stage.execute(
+                    _make_context(
+                        tmp_path,
+                        harnesses=[_make_harness("a"), _make_harness("b")],
+                        extra_config=extra,
+                    )
+                )
+                assert result.data["compiled_count"] == 2
+
+        assert mock_run.call_count == 3
+
+    def test_pch_failure_falls_back_to_plain_compile(self, tmp_path: Path) -> None:
+        ctx = _make_context(
+            tmp_path,
+            harnesses=[_make_harness("a"), _make_harness("b")],
+            extra_config={"compile_pch": True, "compile_use_llm": False},
+        )
+
+        def side_effect(cmd, **kwargs):
+            failed = "c++-header" in cmd
+            stderr = b"error: bad pch" if failed else b""
+            return MagicMock(returncode=int(failed), stderr=stderr, stdout="")
+
+        with patch("subprocess.run", side_effect=side_effect) as mock_run:
+            result = CompileStage().execute(ctx)
+
+        assert result.data["compiled_count"] == 2
+        assert not any("-include-pch" in c.args[0] for c in mock_run.call_args_list)
+
 
 # ---------------------------------------------------------------------------
 # CompileStage: fuzz install prefix linking
@@ -303,15 +532,22 @@ class TestCompileStagePrefix:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is True
         call_args = mock_run.call_args[0][0]
-        cmd_str = " ".join(str(a) for a in call_args)
-        assert f"-L{prefix / 'lib'}" in cmd_str
-        assert f"-I{prefix / 'include'}" in cmd_str
-        assert "-rpath" in cmd_str
+        assert f"-L{prefix / 'lib'}" in call_args
+        assert f"-Wl,-rpath,{prefix / 'lib'}" in call_args
+        assert f"-I{prefix / 'include'}" in call_args
+
+    def test_prefix_flags_only_for_existing_dirs(self, tmp_path: Path) -> None:
+        """_prefix_flags splits include and library flags and skips missing subdirectories."""
+        (tmp_path / "include").mkdir()
+        assert _prefix_flags(tmp_path) == ([f"-I{tmp_path / 'include'}"], [])
+        (tmp_path / "lib").mkdir()
+        lib = tmp_path / "lib"
+        assert _prefix_flags(tmp_path)[1] == [f"-L{lib}", f"-Wl,-rpath,{lib}"]
 
     def test_no_prefix_no_link_flags(self, tmp_path: Path) -> None:
         """Without fuzz_install_prefix, no -L/-I flags are added."""
@@ -322,7 +558,7 @@ class TestCompileStagePrefix:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is True
@@ -379,8 +615,8 @@ class TestCompileStageLLM:
             nonlocal call_count
             call_count += 1
             if call_count == 1:
-                return MagicMock(returncode=1, stderr="error: missing header", stdout="")
-            return MagicMock(returncode=0, stderr="", stdout="")
+                return MagicMock(returncode=1, stderr=b"error: missing header", stdout="")
+            return MagicMock(returncode=0, stderr=b"", stdout="")
 
         stage = CompileStage()
         with patch("subprocess.run", side_effect=side_effect), \
@@ -434,6 +670,26 @@ class TestCompileStageLLM:
         assert "```" not in result
         assert "LLVMFuzzerTestOneInput" in result
 
+    @pytest.mark.parametrize(
+        "response",
+        [
+            "Here is the fix:\n```c++\n{code}\n```\nThis adds the include.",
+            "```cpp\n{code}\n",
+        ],
+        ids=["prose-around-fence", "unterminated-fence"],
+    )
+    def test_llm_fenced_block_is_extracted(self, response: str) -> None:
+        """Only the fenced code is kept, even with surrounding prose or a missing closing fence."""
+        code = 'extern "C" int LLVMFuzzerTestOneInput(const uint8_t *d, size_t s) { return 0; }'
+        result = CompileStage._ask_llm_for_fix(
+            llm=MagicMock(complete=MagicMock(return_value=response.format(code=code))),
+            compile_cmd="clang++ foo.cpp",
+            source_file="foo.cpp",
+            error_output="error",
+            source_code="old code",
+        )
+        assert result == code
+
     def test_llm_exception_returns_none(self) -> None:
         """When LLM raises an exception, _ask_llm_for_fix returns None."""
         stage = CompileStage()
@@ -455,7 +711,7 @@ class TestCompileStageLLM:
         )
         stage = CompileStage()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stderr="error", stdout="")
+            mock_run.return_value = MagicMock(returncode=1, stderr=b"error", stdout="")
             result = stage.execute(ctx)
 
         assert result.success is False
@@ -584,7 +840,7 @@ class TestCompileCLI:
 
         runner = CliRunner()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"", stdout="")
             result = runner.invoke(main, [
                 "compile",
                 "--targets", str(tmp_path),
@@ -623,8 +879,25 @@ class TestCompileStageConstants:
         assert isinstance(MAX_SOURCE_CODE_CHARS, int)
         assert MAX_SOURCE_CODE_CHARS > 0
 
+    def test_backoff_schedule_doubles_up_to_cap(self) -> None:
+        assert _BACKOFF_SCHEDULE[:3] == (1, 2, 4)
+        assert _BACKOFF_SCHEDULE[-1] == MAX_BACKOFF_SECONDS
+        assert all(b <= MAX_BACKOFF_SECONDS for b in _BACKOFF_SCHEDULE)
+
     def test_parse_compiler_errors_respects_cap(self) -> None:
         """_parse_compiler_errors should cap results at MAX_COMPILER_ERROR_LINES."""
         lines = "\n".join(f"file.cpp:1: error: problem {i}" for i in range(50))
         errors = _parse_compiler_errors(lines)
         assert len(errors) == MAX_COMPILER_ERROR_LINES
+
+    def test_failed_compile_output_is_capped(self, tmp_path: Path) -> None:
+        """A huge stderr is cut to MAX_CAPTURED_OUTPUT_CHARS, keeping the first errors."""
+        stderr = "foo.cpp:1:1: error: first\n" + "x" * (3 * MAX_CAPTURED_OUTPUT_CHARS)
+        failed = MagicMock(returncode=1, stderr=stderr.encode(), stdout="")
+        with patch("subprocess.run", return_value=failed):
+            ok, output = CompileStage._run_compiler(["clang++"], tmp_path, 5)
+
+        assert ok is False
+        assert output.startswith("foo.cpp:1:1: error: first")
+        assert len(output) < MAX_CAPTURED_OUTPUT_CHARS + 100
+        assert output.endswith("more characters truncated]")
@@ -97,3 +97,12 @@ def test_config_manager_fuzz_build_in_default_stages(tmp_path: Path) -> None:
     config_mgr._env_path = tmp_path / ".env"
     config = config_mgr.load()
     assert "fuzz_build" in config.pipeline.stages
+
+
+def test_config_manager_load_writes_nothing_to_project_root(tmp_path: Path) -> None:
+    """Loading a YAML config leaves the project root untouched."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "default.yaml").write_text("llm_provider: ollama\n")
+    assert ConfigManager(project_root=tmp_path).load().llm_provider == "ollama"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config"]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from futagassist.analysis.context_builder import enrich_functions
+from futagassist.analysis.context_builder import _read_lines, enrich_functions
 from futagassist.core.schema import FunctionInfo
 
 
@@ -41,3 +42,23 @@ def test_enrich_functions_missing_file_unchanged(tmp_path: Path) -> None:
     out = enrich_functions([f], tmp_path)
     assert len(out) == 1
     assert out[0].context == ""
+
+
+def test_enrich_functions_reads_shared_file_once(tmp_path: Path) -> None:
+    """Functions in the same file reuse one read; a rewritten file is read again."""
+    src = tmp_path / "lib.c"
+    src.write_text("a\nb\nc\n")
+    funcs = [
+        FunctionInfo(name=n, signature=f"void {n}()", file_path="lib.c", line=i)
+        for i, n in enumerate("abc", 1)
+    ]
+    _read_lines.cache_clear()
+
+    enrich_functions(funcs, tmp_path, before_lines=0, after_lines=0)
+    assert _read_lines.cache_info().misses == 1
+
+    src.write_text("x\ny\nz\n")
+    os.utime(src, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns + 1_000_000))
+    out = enrich_functions(funcs, tmp_path, before_lines=0, after_lines=0)
+    assert [f.context for f in out] == ["x", "y", "z"]
+    assert _read_lines.cache_info().misses == 2
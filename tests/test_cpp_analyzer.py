@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
+import io
 import os
 import subprocess
-import textwrap
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -21,6 +21,7 @@ from cpp_analyzer import (  # type: ignore[import-untyped]
     _codeql_binary_path,
     _codeql_search_path,
     _is_bundle_install,
+    _reset_codeql_caches,
     register,
 )
 from futagassist.core.registry import ComponentRegistry
@@ -31,10 +32,73 @@ from futagassist.core.schema import FunctionInfo
 # Helpers
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _fresh_codeql_lookups() -> None:
+    """CodeQL install lookups are cached per CODEQL_HOME; start every test uncached."""
+    _reset_codeql_caches()
+
+
+@pytest.fixture(scope="module")
+def codeql_bundle(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Read-only CodeQL bundle layout (bin/codeql + qlpacks/codeql/cpp-all) shared by the module."""
+    root = tmp_path_factory.mktemp("codeql-bundle")
+    (root / "bin").mkdir()
+    (root / "bin" / "codeql").touch()
+    (root / "qlpacks" / "codeql" / "cpp-all").mkdir(parents=True)
+    return root
+
+
 def _completed(returncode: int = 0, stdout: bytes = b"", stderr: bytes = b"") -> subprocess.CompletedProcess:
     return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
 
 
+class _StreamingProc:
+    """Popen stand-in whose stdout pipe streams a completed run's output."""
+
+    def __init__(self, completed: subprocess.CompletedProcess) -> None:
+        self.stdout = io.BytesIO(completed.stdout or b"")
+        self.returncode = completed.returncode
+
+    def __enter__(self) -> _StreamingProc:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stdout.close()
+
+    def wait(self, timeout: float | None = None) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+def _popen_from(run):
+    """Popen side effect built from a subprocess.run-style mock."""
+    return lambda cmd, **kwargs: _StreamingProc(run(cmd, **kwargs))
+
+
+def _patch_popen(run):
+    """Patch the plugin's subprocess.Popen with streams from a subprocess.run-style mock."""
+    return patch("cpp_analyzer.subprocess.Popen", side_effect=_popen_from(run))
+
+
+# Decoded `codeql bqrs decode --format=csv` payloads shared by the extract_functions tests
+_LIST_FUNCTIONS_CSV = (
+    b"src/parser.c,42,parse_data,parse_data,int,,const char* data\\, size_t size\n"
+    b"src/util.c,10,helper,,void,,\n"
+)
+_FOO_CSV = b"src/a.c,1,foo,foo,int,,\n"
+_FOO_API_CSV = b"src/a.c,1,foo,api_foo\n"
+_FOO_FUZZ_CSV = b"src/a.c,1,foo,fuzz_foo\n"
+_FOO_BUFFER_CSV = b'src/a.c,1,foo,foo,int,,"const char* data, size_t size"\n'
+_FOO_SEMANTICS_CSV = b"src/a.c,1,foo,0,BUFFER\nsrc/a.c,1,foo,1,SIZE\n"
+_FOO_BAD_SEMANTICS_CSV = (
+    b"src/a.c,1,foo,0,BUFFER\nsrc/a.c,1,foo,x,BOGUS\nsrc/a.c,1,foo,-1,BOGUS\nsrc/a.c,1,foo,1,SIZE\n"
+)
+_SHORT_ROW_CSV = b"a,b\nsrc/a.c,1,foo,foo,int,,\n\n"
+_BAD_LINE_CSV = b"src/a.c,not_a_number,foo,foo,void,,\n"
+
+
 # ===================================================================
 # _codeql_bin
 # ===================================================================
@@ -47,7 +111,9 @@ class TestCodeqlBin:
         monkeypatch.delenv("CODEQL_HOME", raising=False)
         assert _codeql_bin() == "codeql"
 
-    def test_codeql_home_with_direct_binary(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_codeql_home_with_direct_binary(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When CODEQL_HOME/codeql exists, use it."""
         (tmp_path / "codeql").touch()
         monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
@@ -55,11 +121,11 @@ class TestCodeqlBin:
         assert result.endswith("codeql")
         assert str(tmp_path) in result
 
-    def test_codeql_home_with_bin_subdir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_codeql_home_with_bin_subdir(
+        self, codeql_bundle: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When CODEQL_HOME/bin/codeql exists, use it."""
-        (tmp_path / "bin").mkdir()
-        (tmp_path / "bin" / "codeql").touch()
-        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+        monkeypatch.setenv("CODEQL_HOME", str(codeql_bundle))
         result = _codeql_bin()
         assert "bin" in result
         assert result.endswith("codeql")
@@ -84,7 +150,9 @@ class TestCodeqlBinaryPath:
         with patch("cpp_analyzer.shutil.which", return_value=None):
             assert _codeql_binary_path() is None
 
-    def test_returns_path_from_codeql_home(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_returns_path_from_codeql_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         binary = tmp_path / "codeql"
         binary.touch()
         monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
@@ -102,6 +170,45 @@ class TestCodeqlBinaryPath:
             assert result.exists()
 
 
+    def test_codeql_home_does_not_search_path(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """With CODEQL_HOME set, only its candidates are checked, even when none exists."""
+        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+        with patch("cpp_analyzer.shutil.which") as mock_which:
+            assert _codeql_binary_path() is None
+            (tmp_path / "bin").mkdir()
+            (tmp_path / "bin" / "codeql").touch()
+            _reset_codeql_caches()
+            assert _codeql_binary_path() == (tmp_path / "bin" / "codeql").resolve()
+        mock_which.assert_not_called()
+
+    def test_lookup_cached_per_codeql_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """PATH is searched once per CODEQL_HOME value; changing CODEQL_HOME re-resolves."""
+        monkeypatch.delenv("CODEQL_HOME", raising=False)
+        with patch("cpp_analyzer.shutil.which", return_value=None) as mock_which:
+            assert _codeql_binary_path() is None
+            assert _codeql_binary_path() is None
+        mock_which.assert_called_once()
+
+        (tmp_path / "codeql").touch()
+        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+        assert _codeql_binary_path() == (tmp_path / "codeql").resolve()
+
+    def test_path_change_re_resolves(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without CODEQL_HOME, a PATH change is seen without resetting the caches."""
+        monkeypatch.delenv("CODEQL_HOME", raising=False)
+        monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+        assert _codeql_binary_path() is None
+
+        binary = tmp_path / "codeql"
+        binary.touch()
+        binary.chmod(0o755)
+        monkeypatch.setenv("PATH", str(tmp_path))
+        assert _codeql_binary_path() == binary.resolve()
+
 # ===================================================================
 # _is_bundle_install
 # ===================================================================
@@ -115,7 +222,9 @@ class TestIsBundleInstall:
         with patch("cpp_analyzer.shutil.which", return_value=None):
             assert _is_bundle_install() is False
 
-    def test_true_when_qlpacks_sibling(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_true_when_qlpacks_sibling(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Bundle layout: CODEQL_HOME/codeql binary + CODEQL_HOME/qlpacks/codeql/cpp-all/."""
         binary = tmp_path / "codeql"
         binary.touch()
@@ -123,12 +232,11 @@ class TestIsBundleInstall:
         monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
         assert _is_bundle_install() is True
 
-    def test_true_when_qlpacks_in_parent(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_true_when_qlpacks_in_parent(
+        self, codeql_bundle: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Bundle layout: CODEQL_HOME/bin/codeql + CODEQL_HOME/qlpacks/codeql/cpp-all/."""
-        (tmp_path / "bin").mkdir()
-        (tmp_path / "bin" / "codeql").touch()
-        (tmp_path / "qlpacks" / "codeql" / "cpp-all").mkdir(parents=True)
-        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+        monkeypatch.setenv("CODEQL_HOME", str(codeql_bundle))
         assert _is_bundle_install() is True
 
     def test_false_when_no_qlpacks(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -137,6 +245,15 @@ class TestIsBundleInstall:
         monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
         assert _is_bundle_install() is False
 
+    def test_false_when_cpp_pack_is_not_a_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "codeql").touch()
+        (tmp_path / "qlpacks" / "codeql").mkdir(parents=True)
+        (tmp_path / "qlpacks" / "codeql" / "cpp-all").touch()
+        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+        assert _is_bundle_install() is False
+
 
 # ===================================================================
 # _codeql_search_path
@@ -146,12 +263,15 @@ class TestIsBundleInstall:
 class TestCodeqlSearchPath:
     """Tests for _codeql_search_path() helper."""
 
-    def test_empty_for_bundle(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Bundle installs return [] (auto-discovery)."""
-        binary = tmp_path / "codeql"
-        binary.touch()
-        (tmp_path / "qlpacks" / "codeql" / "cpp-all").mkdir(parents=True)
-        monkeypatch.setenv("CODEQL_HOME", str(tmp_path))
+    @pytest.mark.parametrize("with_codeql_home", [True, False], ids=["codeql_home_set", "no_env"])
+    def test_empty_without_codeql_repo(
+        self, codeql_bundle: Path, monkeypatch: pytest.MonkeyPatch, with_codeql_home: bool
+    ) -> None:
+        """With CODEQL_REPO unset there is no search path, whatever CODEQL_HOME points at."""
+        if with_codeql_home:
+            monkeypatch.setenv("CODEQL_HOME", str(codeql_bundle))
+        else:
+            monkeypatch.delenv("CODEQL_HOME", raising=False)
         monkeypatch.delenv("CODEQL_REPO", raising=False)
         assert _codeql_search_path() == []
 
@@ -159,16 +279,23 @@ class TestCodeqlSearchPath:
         """CODEQL_REPO should be added if directory exists."""
         monkeypatch.delenv("CODEQL_HOME", raising=False)
         monkeypatch.setenv("CODEQL_REPO", str(tmp_path))
-        with patch("cpp_analyzer._is_bundle_install", return_value=False):
-            paths = _codeql_search_path()
-            assert len(paths) == 1
-            assert paths[0] == tmp_path.resolve()
-
-    def test_empty_when_no_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.delenv("CODEQL_HOME", raising=False)
-        monkeypatch.delenv("CODEQL_REPO", raising=False)
-        with patch("cpp_analyzer._is_bundle_install", return_value=False):
-            assert _codeql_search_path() == []
+        paths = _codeql_search_path()
+        assert len(paths) == 1
+        assert paths[0].samefile(tmp_path)
+
+    def test_relative_codeql_repo_made_absolute(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "queries").mkdir()
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("CODEQL_REPO", "queries")
+        assert _codeql_search_path() == [Path.cwd() / "queries"]
+
+    def test_missing_codeql_repo_ignored(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("CODEQL_REPO", str(tmp_path / "missing"))
+        assert _codeql_search_path() == []
 
 
 # ===================================================================
@@ -188,16 +315,23 @@ class TestCppAnalyzer:
         analyzer = CppAnalyzer()
         queries = analyzer.get_codeql_queries()
         # The .ql files exist in the repository
-        assert len(queries) >= 1
-        assert any("list_functions" in str(q) for q in queries)
+        assert "list_functions" in {q.stem for q in queries}
 
     def test_get_codeql_queries_all_files(self) -> None:
         """Should return 4 queries: list_functions, api_functions, fuzz_targets, parameter_semantics."""
         analyzer = CppAnalyzer()
         queries = analyzer.get_codeql_queries()
-        names = [q.stem for q in queries]
-        for expected in ("list_functions", "api_functions", "fuzz_targets", "parameter_semantics"):
-            assert expected in names, f"Missing query: {expected}"
+        expected = {"list_functions", "api_functions", "fuzz_targets", "parameter_semantics"}
+        assert expected <= {q.stem for q in queries}
+
+    def test_get_codeql_queries_checks_files_once_per_instance(self) -> None:
+        """Query files are checked on first use per analyzer; a new analyzer checks again."""
+        analyzer = CppAnalyzer()
+        first = analyzer.get_codeql_queries()
+        with patch.object(Path, "is_file", return_value=False) as mock_is_file:
+            assert analyzer.get_codeql_queries() == first
+            mock_is_file.assert_not_called()
+            assert CppAnalyzer().get_codeql_queries() == []
 
     def test_get_compiler_flags(self) -> None:
         analyzer = CppAnalyzer()
@@ -274,11 +408,6 @@ class TestExtractFunctions:
         db = tmp_path / "codeql-db"
         db.mkdir()
 
-        csv_text = textwrap.dedent("""\
-            src/parser.c,42,parse_data,parse_data,int,,const char* data\\, size_t size
-            src/util.c,10,helper,,void,,
-        """)
-
         self._make_bqrs_tree(db, {"list_functions/results.bqrs": b"fake-bqrs"})
 
         def mock_run_queries(*args, **kwargs):
@@ -286,11 +415,11 @@ class TestExtractFunctions:
 
         def mock_subprocess_run(cmd, **kwargs):
             if "bqrs" in cmd and "decode" in cmd:
-                return _completed(0, stdout=csv_text.encode())
+                return _completed(0, stdout=_LIST_FUNCTIONS_CSV)
             return _completed(1)
 
         with patch.object(analyzer._runner, "run_queries", side_effect=mock_run_queries):
-            with patch("cpp_analyzer.subprocess.run", side_effect=mock_subprocess_run):
+            with _patch_popen(mock_subprocess_run):
                 result = analyzer.extract_functions(db)
 
         assert len(result) == 2
@@ -307,82 +436,119 @@ class TestExtractFunctions:
         db = tmp_path / "codeql-db"
         db.mkdir()
 
-        list_csv = "src/a.c,1,foo,foo,int,,\n"
-        api_csv = "src/a.c,1,foo,api_foo\n"
-        fuzz_csv = "src/a.c,1,foo,fuzz_foo\n"
-
         self._make_bqrs_tree(db, {
             "list_functions/results.bqrs": b"fake",
             "api_functions/results.bqrs": b"fake",
             "fuzz_targets/results.bqrs": b"fake",
         })
 
-        call_count = {"n": 0}
-        csv_responses = [list_csv, api_csv, fuzz_csv]
+        csv_by_query = {
+            "list_functions": _FOO_CSV,
+            "api_functions": _FOO_API_CSV,
+            "fuzz_targets": _FOO_FUZZ_CSV,
+        }
 
         def mock_subprocess_run(cmd, **kwargs):
             if "bqrs" in cmd and "decode" in cmd:
-                idx = min(call_count["n"], len(csv_responses) - 1)
-                call_count["n"] += 1
-                return _completed(0, stdout=csv_responses[idx].encode())
+                query = Path(cmd[-1]).parent.name
+                return _completed(0, stdout=csv_by_query[query])
             return _completed(1)
 
         with patch.object(analyzer._runner, "run_queries", return_value=_completed(0)):
-            with patch("cpp_analyzer.subprocess.run", side_effect=mock_subprocess_run):
+            with _patch_popen(mock_subprocess_run):
                 result = analyzer.extract_functions(db)
 
         assert len(result) == 1
         assert result[0].is_api is True
         assert result[0].is_fuzz_target_candidate is True
 
-    def test_merges_parameter_semantics(self, tmp_path: Path) -> None:
-        """Parameter semantics from the parameter_semantics query get merged."""
+    @pytest.mark.parametrize(
+        "semantics_csv",
+        [_FOO_SEMANTICS_CSV, _FOO_BAD_SEMANTICS_CSV],
+        ids=["well_formed", "bad_param_index_rows_skipped"],
+    )
+    def test_merges_parameter_semantics(self, tmp_path: Path, semantics_csv: bytes) -> None:
+        """Parameter semantics get merged; rows with a bad param_index are skipped, not fatal."""
         analyzer = CppAnalyzer()
         db = tmp_path / "codeql-db"
         db.mkdir()
 
-        list_csv = 'src/a.c,1,foo,foo,int,,"const char* data, size_t size"\n'
-        sem_csv = "src/a.c,1,foo,0,BUFFER\nsrc/a.c,1,foo,1,SIZE\n"
-
         self._make_bqrs_tree(db, {
             "list_functions/results.bqrs": b"fake",
             "parameter_semantics/results.bqrs": b"fake",
         })
 
-        call_count = {"n": 0}
-        csv_responses = [list_csv, sem_csv]
+        csv_by_query = {"list_functions": _FOO_BUFFER_CSV, "parameter_semantics": semantics_csv}
 
         def mock_subprocess_run(cmd, **kwargs):
             if "bqrs" in cmd and "decode" in cmd:
-                idx = min(call_count["n"], len(csv_responses) - 1)
-                call_count["n"] += 1
-                return _completed(0, stdout=csv_responses[idx].encode())
+                query = Path(cmd[-1]).parent.name
+                return _completed(0, stdout=csv_by_query[query])
             return _completed(1)
 
         with patch.object(analyzer._runner, "run_queries", return_value=_completed(0)):
-            with patch("cpp_analyzer.subprocess.run", side_effect=mock_subprocess_run):
+            with _patch_popen(mock_subprocess_run):
                 result = analyzer.extract_functions(db)
 
         assert len(result) == 1
         assert result[0].parameter_semantics == ["BUFFER", "SIZE"]
 
+    def test_no_decode_without_list_functions_results(self, tmp_path: Path) -> None:
+        """Auxiliary BQRS alone are never decoded when list_functions cannot be produced."""
+        analyzer = CppAnalyzer()
+        db = tmp_path / "codeql-db"
+        db.mkdir()
+        self._make_bqrs_tree(db, {"api_functions/results.bqrs": b"fake"})
+
+        run_results = [_completed(0), _completed(1)]
+        with patch.object(analyzer._runner, "run_queries", side_effect=run_results) as mock_rq:
+            with patch("cpp_analyzer.subprocess.Popen") as mock_popen:
+                result = analyzer.extract_functions(db)
+
+        assert result == []
+        assert mock_rq.call_count == 2
+        assert mock_rq.call_args.args[1] == [analyzer._list_functions_ql]
+        mock_popen.assert_not_called()
+
+    def test_reruns_list_functions_before_decoding(self, tmp_path: Path) -> None:
+        """A missing list_functions result is re-run alone, then merged with the auxiliary ones."""
+        analyzer = CppAnalyzer()
+        db = tmp_path / "codeql-db"
+        db.mkdir()
+        self._make_bqrs_tree(db, {"api_functions/results.bqrs": b"fake"})
+
+        def mock_run_queries(db_path, queries, **kwargs):
+            if queries == [analyzer._list_functions_ql]:
+                self._make_bqrs_tree(db, {"list_functions/results.bqrs": b"fake"})
+            return _completed(0)
+
+        csv_by_query = {"list_functions": _FOO_CSV, "api_functions": _FOO_API_CSV}
+
+        def mock_subprocess_run(cmd, **kwargs):
+            return _completed(0, stdout=csv_by_query[Path(cmd[-1]).parent.name])
+
+        with patch.object(analyzer._runner, "run_queries", side_effect=mock_run_queries):
+            with _patch_popen(mock_subprocess_run):
+                result = analyzer.extract_functions(db)
+
+        assert [f.name for f in result] == ["foo"]
+        assert result[0].is_api is True
+
     def test_handles_invalid_csv_rows_gracefully(self, tmp_path: Path) -> None:
         """Short/malformed rows should be skipped without error."""
         analyzer = CppAnalyzer()
         db = tmp_path / "codeql-db"
         db.mkdir()
 
-        csv_text = "a,b\nsrc/a.c,1,foo,foo,int,,\n\n"
-
         self._make_bqrs_tree(db, {"list_functions/results.bqrs": b"fake"})
 
         def mock_subprocess_run(cmd, **kwargs):
             if "bqrs" in cmd and "decode" in cmd:
-                return _completed(0, stdout=csv_text.encode())
+                return _completed(0, stdout=_SHORT_ROW_CSV)
             return _completed(1)
 
         with patch.object(analyzer._runner, "run_queries", return_value=_completed(0)):
-            with patch("cpp_analyzer.subprocess.run", side_effect=mock_subprocess_run):
+            with _patch_popen(mock_subprocess_run):
                 result = analyzer.extract_functions(db)
 
         # Only the valid row should be parsed
@@ -395,22 +561,37 @@ class TestExtractFunctions:
         db = tmp_path / "codeql-db"
         db.mkdir()
 
-        csv_text = "src/a.c,not_a_number,foo,foo,void,,\n"
-
         self._make_bqrs_tree(db, {"list_functions/results.bqrs": b"fake"})
 
         def mock_subprocess_run(cmd, **kwargs):
             if "bqrs" in cmd and "decode" in cmd:
-                return _completed(0, stdout=csv_text.encode())
+                return _completed(0, stdout=_BAD_LINE_CSV)
             return _completed(1)
 
         with patch.object(analyzer._runner, "run_queries", return_value=_completed(0)):
-            with patch("cpp_analyzer.subprocess.run", side_effect=mock_subprocess_run):
+            with _patch_popen(mock_subprocess_run):
                 result = analyzer.extract_functions(db)
 
         assert len(result) == 1
         assert result[0].line == 0
 
+    def test_failed_decode_drops_streamed_rows(self, tmp_path: Path) -> None:
+        """Rows streamed before the decoder exits non-zero are discarded."""
+        analyzer = CppAnalyzer()
+        db = tmp_path / "codeql-db"
+        db.mkdir()
+
+        self._make_bqrs_tree(db, {"list_functions/results.bqrs": b"fake"})
+
+        def mock_subprocess_run(cmd, **kwargs):
+            return _completed(2, stdout=b"src/a.c,1,foo,foo,int,,\n")
+
+        with patch.object(analyzer._runner, "run_queries", return_value=_completed(0)):
+            with _patch_popen(mock_subprocess_run):
+                result = analyzer.extract_functions(db)
+
+        assert result == []
+
     def test_returns_empty_when_no_queries_found(self, tmp_path: Path) -> None:
         """If no .ql files exist at the expected paths, return []."""
         analyzer = CppAnalyzer()
@@ -30,34 +30,29 @@ def test_fuzz_build_stage_repo_not_dir(tmp_path: Path) -> None:
     assert "directory" in result.message.lower() or "not" in result.message.lower()
 
 
-def test_fuzz_build_stage_can_skip_when_prefix_has_lib(tmp_path: Path) -> None:
-    """can_skip returns True when fuzz_install_prefix exists and has lib/."""
-    (tmp_path / "lib").mkdir(parents=True)
-    stage = FuzzBuildStage()
-    ctx = PipelineContext(repo_path=tmp_path, fuzz_install_prefix=tmp_path, config={})
-    assert stage.can_skip(ctx) is True
-
-
-def test_fuzz_build_stage_can_skip_when_prefix_has_include(tmp_path: Path) -> None:
-    """can_skip returns True when fuzz_install_prefix exists and has include/."""
-    (tmp_path / "include").mkdir(parents=True)
-    stage = FuzzBuildStage()
-    ctx = PipelineContext(repo_path=tmp_path, config={"fuzz_install_prefix": str(tmp_path)})
-    assert stage.can_skip(ctx) is True
-
-
-def test_fuzz_build_stage_can_skip_when_no_prefix(tmp_path: Path) -> None:
-    """can_skip returns False when fuzz_install_prefix is None."""
-    stage = FuzzBuildStage()
-    ctx = PipelineContext(repo_path=tmp_path, config={})
-    assert stage.can_skip(ctx) is False
-
-
-def test_fuzz_build_stage_can_skip_when_prefix_empty_dir(tmp_path: Path) -> None:
-    """can_skip returns False when prefix dir exists but has no lib or include."""
-    stage = FuzzBuildStage()
-    ctx = PipelineContext(repo_path=tmp_path, fuzz_install_prefix=tmp_path, config={})
-    assert stage.can_skip(ctx) is False
+@pytest.mark.parametrize(
+    ("dirs", "prefix_source", "expected"),
+    [
+        (["lib"], "field", True),
+        (["include"], "config", True),
+        ([], None, False),
+        ([], "field", False),
+    ],
+    ids=["prefix_has_lib", "config_prefix_has_include", "no_prefix", "prefix_empty_dir"],
+)
+def test_fuzz_build_stage_can_skip(
+    tmp_path: Path, dirs: list[str], prefix_source: str | None, expected: bool
+) -> None:
+    """can_skip is True only when fuzz_install_prefix (field or config) has lib/ or include/."""
+    for name in dirs:
+        (tmp_path / name).mkdir()
+    if prefix_source == "field":
+        ctx = PipelineContext(repo_path=tmp_path, fuzz_install_prefix=tmp_path, config={})
+    elif prefix_source == "config":
+        ctx = PipelineContext(repo_path=tmp_path, config={"fuzz_install_prefix": str(tmp_path)})
+    else:
+        ctx = PipelineContext(repo_path=tmp_path, config={})
+    assert FuzzBuildStage().can_skip(ctx) is expected
 
 
 def test_fuzz_build_stage_execute_success(tmp_path: Path) -> None:
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from click.testing import CliRunner
 
 from futagassist.core.config import ConfigManager
 from futagassist.core.registry import ComponentRegistry
-
-from _helpers import make_config_manager
 from futagassist.core.schema import (
     CoverageReport,
     CrashInfo,
@@ -26,9 +27,6 @@ from futagassist.stages.fuzz_stage import FuzzStage, _deduplicate_crashes
 # ---------------------------------------------------------------------------
 
 
-_make_config_manager = make_config_manager
-
-
 class _MockFuzzerEngine:
     """Minimal FuzzerEngine implementation for tests."""
 
@@ -59,28 +57,18 @@ class _MockFuzzerEngine:
         return CoverageReport(binary_path=str(binary), profdata_path=str(profdata))
 
 
-def _make_registry_with_engine() -> ComponentRegistry:
-    registry = ComponentRegistry()
-    from futagassist.stages import register_builtin_stages
-    register_builtin_stages(registry)
-    registry.register_fuzzer("mock", _MockFuzzerEngine)
-    return registry
+#: ``make_context(binaries=..., extra_config=...)``
+ContextFactory = Callable[..., PipelineContext]
 
 
 def _make_context(
     tmp_path: Path,
-    with_engine: bool = True,
+    config_mgr: ConfigManager,
+    registry: ComponentRegistry,
     binaries: list[str] | None = None,
     extra_config: dict | None = None,
 ) -> PipelineContext:
-    if with_engine:
-        registry = _make_registry_with_engine()
-    else:
-        registry = ComponentRegistry()
-        from futagassist.stages import register_builtin_stages
-        register_builtin_stages(registry)
-
-    config_mgr = _make_config_manager(tmp_path)
+    registry.register_fuzzer("mock", _MockFuzzerEngine)
     config_mgr._config.fuzzer_engine = "mock"
 
     # Create binary files
@@ -104,6 +92,14 @@ def _make_context(
     )
 
 
+@pytest.fixture()
+def make_context(
+    tmp_path: Path, config_manager: ConfigManager, builtin_registry: ComponentRegistry
+) -> ContextFactory:
+    """_make_context bound to this test's tmp_path, config manager and registry copy."""
+    return partial(_make_context, tmp_path, config_manager, builtin_registry)
+
+
 # ---------------------------------------------------------------------------
 # Unit tests: _deduplicate_crashes
 # ---------------------------------------------------------------------------
@@ -158,6 +154,16 @@ class TestDeduplicateCrashes:
         result = _deduplicate_crashes(crashes)
         assert len(result) == 3
 
+    @pytest.mark.parametrize("n", [1000, 10_000])
+    def test_many_colliding_crashes(self, n: int) -> None:
+        """Thousands of crashes over a few locations keep the first of each, in order."""
+        crashes = [
+            CrashInfo(crash_file="a.c", crash_line=i % 10 + 1, warn_class="ASAN")
+            for i in range(n)
+        ]
+        result = _deduplicate_crashes(crashes)
+        assert result == crashes[:10]
+
 
 # ---------------------------------------------------------------------------
 # FuzzStage: validation
@@ -172,15 +178,23 @@ class TestFuzzStageValidation:
         assert result.success is False
         assert "registry" in result.message.lower()
 
-    def test_no_fuzzer_engine(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, with_engine=False, extra_config={"fuzz_engine": "nonexistent"})
+    def test_no_fuzzer_engine(
+        self, tmp_path: Path, builtin_registry: ComponentRegistry, config_manager: ConfigManager
+    ) -> None:
+        """Engine lookup fails before any binaries directory is needed."""
+        config = {
+            "registry": builtin_registry,
+            "config_manager": config_manager,
+            "fuzz_engine": "nonexistent",
+        }
+        ctx = PipelineContext(repo_path=tmp_path, config=config)
         stage = FuzzStage()
         result = stage.execute(ctx)
         assert result.success is False
         assert "not registered" in result.message.lower() or "nonexistent" in result.message
 
-    def test_no_binaries(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=[])
+    def test_no_binaries(self, make_context: ContextFactory) -> None:
+        ctx = make_context(binaries=[])
         stage = FuzzStage()
         result = stage.execute(ctx)
         assert result.success is False
@@ -193,8 +207,8 @@ class TestFuzzStageValidation:
 
 
 class TestFuzzStageExecution:
-    def test_fuzz_single_binary(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=["fuzz_foo"])
+    def test_fuzz_single_binary(self, make_context: ContextFactory) -> None:
+        ctx = make_context(binaries=["fuzz_foo"])
         stage = FuzzStage()
         result = stage.execute(ctx)
 
@@ -203,16 +217,16 @@ class TestFuzzStageExecution:
         assert len(result.data["fuzz_results"]) == 1
         assert "results_dir" in result.data
 
-    def test_fuzz_multiple_binaries(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=["fuzz_a", "fuzz_b", "fuzz_c"])
+    def test_fuzz_multiple_binaries(self, make_context: ContextFactory) -> None:
+        ctx = make_context(binaries=["fuzz_a", "fuzz_b", "fuzz_c"])
         stage = FuzzStage()
         result = stage.execute(ctx)
 
         assert result.success is True
         assert result.data["binaries_fuzzed"] == 3
 
-    def test_fuzz_creates_corpus_and_artifact_dirs(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=["fuzz_test"])
+    def test_fuzz_creates_corpus_and_artifact_dirs(self, make_context: ContextFactory) -> None:
+        ctx = make_context(binaries=["fuzz_test"])
         stage = FuzzStage()
         result = stage.execute(ctx)
 
@@ -221,55 +235,50 @@ class TestFuzzStageExecution:
         assert (results_dir / "fuzz_test" / "corpus").is_dir()
         assert (results_dir / "fuzz_test" / "artifacts").is_dir()
 
-    def test_fuzz_with_crashes(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=["fuzz_foo"])
+    def test_fuzz_with_crashes(
+        self, make_context: ContextFactory, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        ctx = make_context(binaries=["fuzz_foo"])
         stage = FuzzStage()
 
         # Patch engine to return crashes
         registry = ctx.config["registry"]
         engine_cls = registry._fuzzer_engines["mock"]
-        original_parse = engine_cls.parse_crashes
 
         def mock_parse(self, artifact_dir):
             return [
                 CrashInfo(crash_file="foo.c", crash_line=42, warn_class="ASAN", summary="heap-buffer-overflow"),
             ]
 
-        engine_cls.parse_crashes = mock_parse
-        try:
-            result = stage.execute(ctx)
-        finally:
-            engine_cls.parse_crashes = original_parse
+        monkeypatch.setattr(engine_cls, "parse_crashes", mock_parse)
+        result = stage.execute(ctx)
 
         assert result.success is True
         assert result.data["total_crashes"] == 1
         assert result.data["unique_crashes"] == 1
 
-    def test_fuzz_engine_exception_graceful(self, tmp_path: Path) -> None:
+    def test_fuzz_engine_exception_graceful(
+        self, make_context: ContextFactory, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """When FuzzerEngine.fuzz() raises, result is marked as failed but stage continues."""
-        ctx = _make_context(tmp_path, binaries=["fuzz_boom"])
+        ctx = make_context(binaries=["fuzz_boom"])
         stage = FuzzStage()
 
         registry = ctx.config["registry"]
         engine_cls = registry._fuzzer_engines["mock"]
-        original_fuzz = engine_cls.fuzz
 
         def boom_fuzz(self, binary, corpus_dir, **options):
             raise RuntimeError("engine crashed")
 
-        engine_cls.fuzz = boom_fuzz
-        try:
-            result = stage.execute(ctx)
-        finally:
-            engine_cls.fuzz = original_fuzz
+        monkeypatch.setattr(engine_cls, "fuzz", boom_fuzz)
+        result = stage.execute(ctx)
 
         # Stage returns a result (success=False for the binary, but stage still completes)
         assert result.data["binaries_fuzzed"] == 1
 
-    def test_fuzz_custom_results_dir(self, tmp_path: Path) -> None:
+    def test_fuzz_custom_results_dir(self, tmp_path: Path, make_context: ContextFactory) -> None:
         custom_dir = tmp_path / "my_results"
-        ctx = _make_context(
-            tmp_path,
+        ctx = make_context(
             binaries=["fuzz_foo"],
             extra_config={"fuzz_results_dir": str(custom_dir)},
         )
@@ -287,11 +296,26 @@ class TestFuzzStageExecution:
 
 
 class TestFuzzStageBinaryDiscovery:
-    def test_discover_from_binaries_dir(self, tmp_path: Path) -> None:
-        ctx = _make_context(tmp_path, binaries=["fuzz_a", "fuzz_b"])
-        stage = FuzzStage()
-        binaries = stage._discover_binaries(ctx)
-        assert len(binaries) == 2
+    @pytest.mark.parametrize(
+        ("files", "expected"),
+        [
+            (["fuzz_a", "fuzz_b"], ["fuzz_a", "fuzz_b"]),
+            (["fuzz_a", "fuzz_a.cpp", "fuzz_a.o"], ["fuzz_a"]),
+            ([], []),
+        ],
+        ids=["two_binaries", "extensions_ignored", "empty_dir"],
+    )
+    def test_discover_from_binaries_dir(
+        self, tmp_path: Path, files: list[str], expected: list[str]
+    ) -> None:
+        binaries_dir = tmp_path / "fuzz_binaries"
+        binaries_dir.mkdir()
+        for name in files:
+            (binaries_dir / name).write_bytes(b"\x7fELF")
+
+        ctx = PipelineContext(repo_path=tmp_path, binaries_dir=binaries_dir)
+        binaries = FuzzStage()._discover_binaries(ctx)
+        assert sorted(b.name for b in binaries) == expected
 
     def test_discover_from_compile_stage_results(self, tmp_path: Path) -> None:
         bin_dir = tmp_path / "bins"
@@ -318,26 +342,6 @@ class TestFuzzStageBinaryDiscovery:
         binaries = stage._discover_binaries(ctx)
         assert len(binaries) == 2
 
-    def test_discover_ignores_files_with_extension(self, tmp_path: Path) -> None:
-        binaries_dir = tmp_path / "fuzz_binaries"
-        binaries_dir.mkdir()
-        (binaries_dir / "fuzz_a").write_bytes(b"\x7fELF")
-        (binaries_dir / "fuzz_a.cpp").write_text("source")
-        (binaries_dir / "fuzz_a.o").write_bytes(b"\x00")
-
-        ctx = PipelineContext(repo_path=tmp_path, binaries_dir=binaries_dir)
-        stage = FuzzStage()
-        binaries = stage._discover_binaries(ctx)
-        assert len(binaries) == 1
-        assert binaries[0].name == "fuzz_a"
-
-    def test_discover_empty_dir(self, tmp_path: Path) -> None:
-        binaries_dir = tmp_path / "empty"
-        binaries_dir.mkdir()
-        ctx = PipelineContext(repo_path=tmp_path, binaries_dir=binaries_dir)
-        stage = FuzzStage()
-        assert stage._discover_binaries(ctx) == []
-
 
 # ---------------------------------------------------------------------------
 # FuzzStage: can_skip
@@ -345,15 +349,14 @@ class TestFuzzStageBinaryDiscovery:
 
 
 class TestFuzzStageCanSkip:
-    def test_can_skip_with_results(self) -> None:
-        ctx = PipelineContext(fuzz_results=[FuzzResult(success=True)])
-        stage = FuzzStage()
-        assert stage.can_skip(ctx) is True
-
-    def test_cannot_skip_no_results(self) -> None:
-        ctx = PipelineContext()
-        stage = FuzzStage()
-        assert stage.can_skip(ctx) is False
+    @pytest.mark.parametrize(
+        ("fuzz_results", "expected"),
+        [([FuzzResult(success=True)], True), ([], False)],
+        ids=["with_results", "no_results"],
+    )
+    def test_can_skip(self, fuzz_results: list[FuzzResult], expected: bool) -> None:
+        ctx = PipelineContext(fuzz_results=fuzz_results)
+        assert FuzzStage().can_skip(ctx) is expected
 
 
 # ---------------------------------------------------------------------------
@@ -362,11 +365,9 @@ class TestFuzzStageCanSkip:
 
 
 class TestFuzzCLI:
-    def test_cli_fuzz_help(self) -> None:
-        from click.testing import CliRunner
+    def test_cli_fuzz_help(self, runner: CliRunner) -> None:
         from futagassist.cli import main
 
-        runner = CliRunner()
         result = runner.invoke(main, ["fuzz", "--help"])
         assert result.exit_code == 0
         assert "--binaries" in result.output
@@ -375,13 +376,11 @@ class TestFuzzCLI:
         assert "--fork" in result.output
         assert "--no-coverage" in result.output
 
-    def test_cli_fuzz_no_binaries(self, tmp_path: Path) -> None:
-        from click.testing import CliRunner
+    def test_cli_fuzz_no_binaries(self, tmp_path: Path, runner: CliRunner) -> None:
         from futagassist.cli import main
 
         empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
-        runner = CliRunner()
         result = runner.invoke(main, ["fuzz", "--binaries", str(empty_dir)])
         assert result.exit_code != 0
         assert "No fuzz binaries" in result.output
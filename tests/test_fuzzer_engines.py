@@ -4,12 +4,27 @@ from __future__ import annotations
 
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
 from futagassist.core.registry import ComponentRegistry
 from futagassist.core.schema import CoverageReport, CrashInfo, FuzzResult
+from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
+from plugins.fuzzer.aflpp_engine import register as register_aflpp
+from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine, _parse_duration, _parse_execs_per_sec
+from plugins.fuzzer.libfuzzer_engine import register as register_libfuzzer
+
+
+def _completed(
+    returncode: int = 0, stdout: str = "", stderr: str = ""
+) -> subprocess.CompletedProcess:
+    """Text-mode ``subprocess.run`` result, as the engines request with ``text=True``."""
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+#: stderr tail of a libFuzzer run that finished normally
+_LIBFUZZER_DONE = "Done 1000 runs in 10 second\nexec/s: 100\n"
 
 
 # ---------------------------------------------------------------------------
@@ -19,64 +34,33 @@ from futagassist.core.schema import CoverageReport, CrashInfo, FuzzResult
 
 class TestLibFuzzerEngine:
     def test_register(self) -> None:
-        from plugins.fuzzer.libfuzzer_engine import register
         reg = ComponentRegistry()
-        register(reg)
+        register_libfuzzer(reg)
         assert "libfuzzer" in reg.list_available()["fuzzer_engines"]
 
-    def test_fuzz_success(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
-        binary = tmp_path / "fuzz_test"
-        binary.write_bytes(b"\x7fELF")
-        corpus = tmp_path / "corpus"
-        corpus.mkdir()
-
+    @pytest.mark.parametrize(
+        ("run_patch", "expected"),
+        [
+            ({"return_value": _completed(0, stderr=_LIBFUZZER_DONE)}, (True, 10.0, 100.0)),
+            # exit 1 = crash found, still "success"; duration falls back to max_total_time
+            ({"return_value": _completed(1, stderr="exec/s: 50")}, (True, 10.0, 50.0)),
+            ({"side_effect": subprocess.TimeoutExpired("cmd", 90)}, (False, 10.0, 0.0)),
+            ({"side_effect": FileNotFoundError("not found")}, (False, 0.0, 0.0)),
+        ],
+        ids=["success", "crash_found", "timeout", "binary_not_found"],
+    )
+    def test_fuzz_outcome(
+        self, tmp_path: Path, run_patch: dict[str, object], expected: tuple[bool, float, float]
+    ) -> None:
+        """fuzz() maps each subprocess outcome to (success, duration_seconds, execs_per_sec)."""
         engine = LibFuzzerEngine()
-        mock_result = MagicMock(
-            returncode=0,
-            stderr="Done 1000 runs in 10 second\nexec/s: 100\n",
-            stdout="",
-        )
-        with patch("subprocess.run", return_value=mock_result):
-            result = engine.fuzz(binary, corpus, max_total_time=10)
+        with patch("subprocess.run", **run_patch):
+            result = engine.fuzz(tmp_path / "fuzz_test", tmp_path / "corpus", max_total_time=10)
 
         assert isinstance(result, FuzzResult)
-        assert result.success is True
-        assert result.duration_seconds == 10.0
-        assert result.execs_per_sec == 100.0
-
-    def test_fuzz_crash_found(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
-        engine = LibFuzzerEngine()
-        mock_result = MagicMock(returncode=1, stderr="exec/s: 50", stdout="")
-        with patch("subprocess.run", return_value=mock_result):
-            result = engine.fuzz(tmp_path / "bin", tmp_path / "corpus")
-
-        assert result.success is True  # exit 1 = crash found, still "success"
-
-    def test_fuzz_timeout(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
-        engine = LibFuzzerEngine()
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 90)):
-            result = engine.fuzz(tmp_path / "bin", tmp_path / "corpus", max_total_time=60)
-
-        assert result.success is False
-
-    def test_fuzz_binary_not_found(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
-        engine = LibFuzzerEngine()
-        with patch("subprocess.run", side_effect=FileNotFoundError("not found")):
-            result = engine.fuzz(tmp_path / "missing", tmp_path / "corpus")
-
-        assert result.success is False
+        assert (result.success, result.duration_seconds, result.execs_per_sec) == expected
 
     def test_parse_crashes(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
         artifacts = tmp_path / "artifacts"
         artifacts.mkdir()
         (artifacts / "crash-abc123").write_bytes(b"\x00")
@@ -93,30 +77,33 @@ class TestLibFuzzerEngine:
         assert classes == {"CRASH", "LEAK", "TIMEOUT", "OOM"}
 
     def test_parse_crashes_empty_dir(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
         empty = tmp_path / "empty"
         empty.mkdir()
         engine = LibFuzzerEngine()
         assert engine.parse_crashes(empty) == []
 
     def test_parse_crashes_nonexistent(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
         engine = LibFuzzerEngine()
         assert engine.parse_crashes(tmp_path / "nonexistent") == []
 
-    def test_get_coverage_no_profdata(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
+    def test_parse_crashes_skips_dirs_and_sorts(self, tmp_path: Path) -> None:
+        (tmp_path / "crash-subdir").mkdir()
+        (tmp_path / "leak-b").write_bytes(b"\x00")
+        (tmp_path / "crash-a").write_bytes(b"\x00")
+
+        crashes = LibFuzzerEngine().parse_crashes(tmp_path)
+
+        expected = [str(tmp_path / "crash-a"), str(tmp_path / "leak-b")]
+        assert [c.artifact_path for c in crashes] == expected
+        assert LibFuzzerEngine().parse_crashes(tmp_path / "crash-a") == []
 
+    def test_get_coverage_no_profdata(self, tmp_path: Path) -> None:
         engine = LibFuzzerEngine()
         cov = engine.get_coverage(tmp_path / "binary", tmp_path / "default.profdata")
         assert isinstance(cov, CoverageReport)
         assert cov.lines_total == 0
 
     def test_get_coverage_merges_profraw(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.libfuzzer_engine import LibFuzzerEngine
-
         profraw = tmp_path / "default.profraw"
         profraw.write_bytes(b"raw")
         profdata = tmp_path / "default.profdata"
@@ -125,8 +112,8 @@ class TestLibFuzzerEngine:
         with patch("subprocess.run") as mock_run:
             # First call: profdata merge; second: llvm-cov export
             mock_run.side_effect = [
-                MagicMock(returncode=0),  # merge
-                MagicMock(returncode=1, stdout=""),  # export fails
+                _completed(0),  # merge
+                _completed(1),  # export fails
             ]
             cov = engine.get_coverage(tmp_path / "binary", profdata)
 
@@ -135,14 +122,14 @@ class TestLibFuzzerEngine:
 
 class TestLibFuzzerHelpers:
     def test_parse_duration(self) -> None:
-        from plugins.fuzzer.libfuzzer_engine import _parse_duration
         assert _parse_duration("Done 5000 runs in 42 second") == 42.0
         assert _parse_duration("no match") == 0.0
 
     def test_parse_execs_per_sec(self) -> None:
-        from plugins.fuzzer.libfuzzer_engine import _parse_execs_per_sec
         assert _parse_execs_per_sec("exec/s: 1234\nexec/s: 5678") == 5678.0
         assert _parse_execs_per_sec("no match") == 0.0
+        # A trailing exec/s: without a number falls back to the last numeric one
+        assert _parse_execs_per_sec("exec/s: 1234\nexec/s: 5678\nexec/s: n/a") == 5678.0
 
 
 # ---------------------------------------------------------------------------
@@ -152,14 +139,11 @@ class TestLibFuzzerHelpers:
 
 class TestAFLPlusPlusEngine:
     def test_register(self) -> None:
-        from plugins.fuzzer.aflpp_engine import register
         reg = ComponentRegistry()
-        register(reg)
+        register_aflpp(reg)
         assert "aflpp" in reg.list_available()["fuzzer_engines"]
 
     def test_fuzz_success(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         binary = tmp_path / "fuzz_test"
         binary.write_bytes(b"\x7fELF")
         corpus = tmp_path / "corpus"
@@ -167,7 +151,7 @@ class TestAFLPlusPlusEngine:
 
         engine = AFLPlusPlusEngine()
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+            mock_run.return_value = _completed(0)
             result = engine.fuzz(binary, corpus, max_total_time=10)
 
         assert result.success is True
@@ -175,8 +159,6 @@ class TestAFLPlusPlusEngine:
         assert any(corpus.iterdir())
 
     def test_fuzz_timeout(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         engine = AFLPlusPlusEngine()
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 120)):
             result = engine.fuzz(tmp_path / "bin", tmp_path / "corpus")
@@ -184,8 +166,6 @@ class TestAFLPlusPlusEngine:
         assert result.success is False
 
     def test_fuzz_not_found(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         engine = AFLPlusPlusEngine()
         with patch("subprocess.run", side_effect=FileNotFoundError("not found")):
             result = engine.fuzz(tmp_path / "bin", tmp_path / "corpus")
@@ -193,8 +173,6 @@ class TestAFLPlusPlusEngine:
         assert result.success is False
 
     def test_parse_crashes_afl_layout(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         crash_dir = tmp_path / "default" / "crashes"
         crash_dir.mkdir(parents=True)
         (crash_dir / "id:000000,sig:06,src:000000,time:123").write_bytes(b"\x00")
@@ -208,14 +186,10 @@ class TestAFLPlusPlusEngine:
         assert all(c.warn_class == "CRASH" for c in crashes)
 
     def test_parse_crashes_empty(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         engine = AFLPlusPlusEngine()
         assert engine.parse_crashes(tmp_path / "nonexistent") == []
 
     def test_get_coverage_returns_empty(self, tmp_path: Path) -> None:
-        from plugins.fuzzer.aflpp_engine import AFLPlusPlusEngine
-
         engine = AFLPlusPlusEngine()
         cov = engine.get_coverage(tmp_path / "bin", tmp_path / "prof")
         assert isinstance(cov, CoverageReport)
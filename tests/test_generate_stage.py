@@ -11,6 +11,8 @@ from futagassist.core.schema import (
     PipelineContext,
     UsageContext,
 )
+from futagassist.generation.harness_generator import HarnessGenerator
+from futagassist.generation.syntax_validator import SyntaxValidator
 from futagassist.stages.generate_stage import GenerateStage
 
 # mock_registry and mock_config_manager are provided by conftest.py.
@@ -187,8 +189,6 @@ class TestHarnessGenerator:
 
     def test_generate_for_function_template(self, sample_functions):
         """Test template-based harness generation."""
-        from futagassist.generation.harness_generator import HarnessGenerator
-
         generator = HarnessGenerator(llm=None, language="cpp")
         harness = generator.generate_for_function(sample_functions[0], use_llm=False)
 
@@ -199,8 +199,6 @@ class TestHarnessGenerator:
 
     def test_generate_for_function_parameter_semantics_file_path(self):
         """Test that FILE_PATH parameter_semantics produces temp-file code."""
-        from futagassist.generation.harness_generator import HarnessGenerator
-
         func = FunctionInfo(
             name="parse_file",
             signature="int parse_file(const char* filename)",
@@ -221,8 +219,6 @@ class TestHarnessGenerator:
 
     def test_generate_for_function_with_llm(self, sample_functions):
         """Test LLM-based harness generation."""
-        from futagassist.generation.harness_generator import HarnessGenerator
-
         mock_llm = MagicMock()
         mock_llm.complete.return_value = '''```cpp
 #include <stdint.h>
@@ -241,8 +237,6 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
 
     def test_generate_batch(self, sample_functions):
         """Test batch generation."""
-        from futagassist.generation.harness_generator import HarnessGenerator
-
         generator = HarnessGenerator(llm=None, language="cpp")
         harnesses = generator.generate_batch(sample_functions, use_llm=False)
 
@@ -251,8 +245,6 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
 
     def test_write_harnesses(self, sample_functions, tmp_path):
         """Test writing harnesses to disk."""
-        from futagassist.generation.harness_generator import HarnessGenerator
-
         generator = HarnessGenerator(llm=None, language="cpp", output_dir=tmp_path)
         harnesses = generator.generate_batch(sample_functions, use_llm=False)
         paths = generator.write_harnesses(harnesses)
@@ -264,72 +256,52 @@ extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
             assert "LLVMFuzzerTestOneInput" in content
 
 
-class TestSyntaxValidator:
-    """Tests for SyntaxValidator."""
-
-    def test_quick_validate_valid_harness(self):
-        """Test quick validation of valid harness."""
-        from futagassist.generation.syntax_validator import SyntaxValidator
-
-        harness = GeneratedHarness(
-            function_name="test",
-            source_code='''
+_VALID_HARNESS_SRC = '''
 #include <stdint.h>
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
     return 0;
 }
-''',
-        )
-
-        validator = SyntaxValidator()
-        result = validator.quick_validate(harness)
-
-        assert result.is_valid
-        assert len(result.validation_errors) == 0
-
-    def test_quick_validate_missing_entry_point(self):
-        """Test quick validation catches missing entry point."""
-        from futagassist.generation.syntax_validator import SyntaxValidator
+'''
 
-        harness = GeneratedHarness(
-            function_name="test",
-            source_code='''
+_NO_ENTRY_POINT_SRC = '''
 #include <stdint.h>
 int main() {
     return 0;
 }
-''',
-        )
-
-        validator = SyntaxValidator()
-        result = validator.quick_validate(harness)
-
-        assert not result.is_valid
-        assert any("LLVMFuzzerTestOneInput" in e for e in result.validation_errors)
+'''
 
-    def test_quick_validate_unbalanced_braces(self):
-        """Test quick validation catches unbalanced braces."""
-        from futagassist.generation.syntax_validator import SyntaxValidator
-
-        harness = GeneratedHarness(
-            function_name="test",
-            source_code='''
+_UNBALANCED_BRACES_SRC = '''
 #include <stdint.h>
 extern "C" int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
     return 0;
-''',
-        )
+'''
 
-        validator = SyntaxValidator()
-        result = validator.quick_validate(harness)
 
-        assert not result.is_valid
-        assert any("brace" in e.lower() for e in result.validation_errors)
+class TestSyntaxValidator:
+    """Tests for SyntaxValidator."""
+
+    @pytest.mark.parametrize(
+        ("source_code", "expect_valid", "error_substr"),
+        [
+            (_VALID_HARNESS_SRC, True, None),
+            (_NO_ENTRY_POINT_SRC, False, "LLVMFuzzerTestOneInput"),
+            (_UNBALANCED_BRACES_SRC, False, "brace"),
+        ],
+        ids=["valid", "missing_entry_point", "unbalanced_braces"],
+    )
+    def test_quick_validate(self, source_code, expect_valid, error_substr):
+        """Test quick validation accepts a valid harness and reports each structural error."""
+        harness = GeneratedHarness(function_name="test", source_code=source_code)
+        result = SyntaxValidator().quick_validate(harness)
+
+        assert result.is_valid is expect_valid
+        if error_substr is None:
+            assert result.validation_errors == []
+        else:
+            assert any(error_substr.lower() in e.lower() for e in result.validation_errors)
 
     def test_check_basic_structure(self):
         """Test basic structure checks."""
-        from futagassist.generation.syntax_validator import SyntaxValidator
-
         validator = SyntaxValidator()
 
         # Valid harness
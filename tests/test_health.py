@@ -13,6 +13,12 @@ from futagassist.core.registry import ComponentRegistry
 from tests.test_registry import _MockLLM
 
 
+@pytest.fixture()
+def checker(config_manager: ConfigManager) -> HealthChecker:
+    """HealthChecker over the default config (rooted at ``tmp_path``) and an empty registry."""
+    return HealthChecker(config=config_manager, registry=ComponentRegistry())
+
+
 def test_health_check_result() -> None:
     r = HealthCheckResult(name="x", ok=True, message="ok")
     assert r.name == "x"
@@ -20,37 +26,25 @@ def test_health_check_result() -> None:
     assert r.message == "ok"
 
 
-def test_health_checker_check_codeql_found() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
+@pytest.mark.parametrize(
+    ("run_result", "ok"),
+    [((True, "2.15.0"), True), ((False, "command not found"), False)],
+    ids=["found", "not_found"],
+)
+def test_health_checker_check_codeql(
+    checker: HealthChecker, run_result: tuple[bool, str], ok: bool
+) -> None:
     with patch("futagassist.core.health._run_cmd") as m:
-        m.return_value = (True, "2.15.0")
+        m.return_value = run_result
         result = checker.check_codeql(verify_packs=False)
     assert result.name == "codeql"
-    assert result.ok is True
-
-
-def test_health_checker_check_codeql_not_found() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
-    with patch("futagassist.core.health._run_cmd") as m:
-        m.return_value = (False, "command not found")
-        result = checker.check_codeql()
-    assert result.name == "codeql"
-    assert result.ok is False
-    assert "not found" in result.message or "command" in result.message.lower()
-    assert result.suggestion != ""
+    assert result.ok is ok
+    assert run_result[1] in result.message
+    # Only a failed check carries an install suggestion.
+    assert (result.suggestion != "") is not ok
 
 
-def test_health_checker_check_llm_no_provider_registered() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
+def test_health_checker_check_llm_no_provider_registered(checker: HealthChecker) -> None:
     result = checker.check_llm()
     assert result.name == "llm"
     assert result.ok is False
@@ -58,35 +52,25 @@ def test_health_checker_check_llm_no_provider_registered() -> None:
     assert result.suggestion != ""
 
 
-def test_health_checker_check_llm_provider_ok() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
+def test_health_checker_check_llm_provider_ok(config_manager: ConfigManager) -> None:
     registry = ComponentRegistry()
     registry.register_llm("openai", _MockLLM)
-    checker = HealthChecker(config=config, registry=registry)
+    checker = HealthChecker(config=config_manager, registry=registry)
     result = checker.check_llm()
     assert result.name == "llm"
     assert result.ok is True
     assert "openai" in result.message
 
 
-def test_health_checker_check_fuzzer_not_registered() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
+def test_health_checker_check_fuzzer_not_registered(checker: HealthChecker) -> None:
     result = checker.check_fuzzer()
     assert result.name == "fuzzer"
     assert result.ok is False
     assert result.suggestion != ""
 
 
-def test_health_checker_check_plugins_no_dir(tmp_path: Path) -> None:
+def test_health_checker_check_plugins_no_dir(checker: HealthChecker) -> None:
     """When plugins/ does not exist, check_plugins fails with suggestion."""
-    config = ConfigManager(project_root=tmp_path)
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
     result = checker.check_plugins()
     assert result.name == "plugins"
     assert result.ok is False
@@ -94,13 +78,11 @@ def test_health_checker_check_plugins_no_dir(tmp_path: Path) -> None:
     assert result.suggestion != ""
 
 
-def test_health_checker_check_plugins_no_analyzer_for_language(tmp_path: Path) -> None:
+def test_health_checker_check_plugins_no_analyzer_for_language(
+    checker: HealthChecker, tmp_path: Path
+) -> None:
     """When plugins/ exists but no analyzer for configured language, check_plugins fails."""
     (tmp_path / "plugins").mkdir(parents=True)
-    config = ConfigManager(project_root=tmp_path)
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
     result = checker.check_plugins()
     assert result.name == "plugins"
     assert result.ok is False
@@ -108,27 +90,21 @@ def test_health_checker_check_plugins_no_analyzer_for_language(tmp_path: Path) -
     assert result.suggestion != ""
 
 
-def test_health_checker_check_plugins_ok(tmp_path: Path) -> None:
+def test_health_checker_check_plugins_ok(config_manager: ConfigManager, tmp_path: Path) -> None:
     """When plugins/ exists and cpp analyzer is registered, check_plugins passes."""
     (tmp_path / "plugins" / "cpp").mkdir(parents=True)
-    config = ConfigManager(project_root=tmp_path)
-    config.load()
     registry = ComponentRegistry()
     # Register cpp so the check sees a language analyzer
     from tests.test_analyze_stage import _MockLanguage
     registry.register_language("cpp", _MockLanguage)
-    checker = HealthChecker(config=config, registry=registry)
+    checker = HealthChecker(config=config_manager, registry=registry)
     result = checker.check_plugins()
     assert result.name == "plugins"
     assert result.ok is True
     assert "cpp" in result.message or "analyzer" in result.message.lower()
 
 
-def test_health_checker_check_all_skip_llm() -> None:
-    config = ConfigManager(project_root=Path("/nonexistent"))
-    config.load()
-    registry = ComponentRegistry()
-    checker = HealthChecker(config=config, registry=registry)
+def test_health_checker_check_all_skip_llm(checker: HealthChecker) -> None:
     results = checker.check_all(skip_llm=True, skip_fuzzer=True, skip_plugins=True)
     assert len(results) == 1
     assert results[0].name == "codeql"
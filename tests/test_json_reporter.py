@@ -9,6 +9,11 @@ from futagassist.core.schema import CoverageReport, CrashInfo, FunctionInfo, Usa
 from futagassist.reporters.json_reporter import JsonReporter
 
 
+def _read_json(path: Path) -> object:
+    """Load a reporter output file; a missing file fails the test with FileNotFoundError."""
+    return json.loads(path.read_bytes())
+
+
 def test_json_reporter_report_analysis(tmp_path: Path) -> None:
     """report_analysis writes functions and usage_contexts to a single JSON file."""
     out = tmp_path / "analysis.json"
@@ -18,8 +23,7 @@ def test_json_reporter_report_analysis(tmp_path: Path) -> None:
         UsageContext(name="seq1", calls=["init", "process", "cleanup"]),
     ]
     reporter.report_analysis(functions, usage_contexts, out)
-    assert out.is_file()
-    data = json.loads(out.read_text())
+    data = _read_json(out)
     assert "functions" in data
     assert len(data["functions"]) == 1
     assert data["functions"][0]["name"] == "f1"
@@ -37,8 +41,7 @@ def test_json_reporter_report_functions(tmp_path: Path) -> None:
         FunctionInfo(name="f2", signature="int f2(int x)", parameters=["int x"], return_type="int"),
     ]
     reporter.report_functions(functions, out)
-    assert out.is_file()
-    data = json.loads(out.read_text())
+    data = _read_json(out)
     assert len(data) == 2
     assert data[0]["name"] == "f1"
     assert data[0]["line"] == 10
@@ -52,8 +55,7 @@ def test_json_reporter_report_coverage(tmp_path: Path) -> None:
     reporter = JsonReporter()
     cov = CoverageReport(binary_path="/bin/fuzz", lines_covered=100, lines_total=200)
     reporter.report_coverage(cov, out)
-    assert out.is_file()
-    data = json.loads(out.read_text())
+    data = _read_json(out)
     assert data["binary_path"] == "/bin/fuzz"
     assert data["lines_covered"] == 100
 
@@ -64,7 +66,6 @@ def test_json_reporter_report_crashes(tmp_path: Path) -> None:
     reporter = JsonReporter()
     crashes = [CrashInfo(artifact_path="crash-1", summary="SIGSEGV")]
     reporter.report_crashes(crashes, out)
-    assert out.is_file()
-    data = json.loads(out.read_text())
+    data = _read_json(out)
     assert len(data) == 1
     assert data[0]["summary"] == "SIGSEGV"
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import os
 import tempfile
 from pathlib import Path
 
 import pytest
 
 from futagassist.core.exceptions import PluginLoadError
-from futagassist.core.plugin_loader import PluginLoader
+from futagassist.core.plugin_loader import PluginLoader, plugin_signature
 from futagassist.core.registry import ComponentRegistry
 
 
@@ -29,6 +30,32 @@ def test_plugin_loader_discover_finds_py_files(tmp_path: Path) -> None:
     assert discovered[0].path == tmp_path / "foo.py"
 
 
+def test_plugin_signature_tracks_plugin_modules(tmp_path: Path) -> None:
+    """plugin_signature is empty without modules and changes when a module is added or edited."""
+    assert plugin_signature(tmp_path / "missing") == ()
+    assert plugin_signature(tmp_path) == ()
+    plugin_file = tmp_path / "foo.py"
+    plugin_file.write_text("x = 1\n")
+    sig = plugin_signature(tmp_path)
+    assert [p for p, _ in sig] == [str(plugin_file)]
+    assert plugin_signature(tmp_path) == sig
+    stat = plugin_file.stat()
+    os.utime(plugin_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert plugin_signature(tmp_path) != sig
+
+
+def test_plugin_signature_tracks_private_helpers(tmp_path: Path) -> None:
+    """Editing a ``_``-prefixed helper a plugin imports changes the signature."""
+    (tmp_path / "foo.py").write_text("from _util import x\n")
+    helper = tmp_path / "_util.py"
+    helper.write_text("x = 1\n")
+    sig = plugin_signature(tmp_path)
+    assert str(helper) in {p for p, _ in sig}
+    stat = helper.stat()
+    os.utime(helper, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert plugin_signature(tmp_path) != sig
+
+
 def test_plugin_loader_load_plugin_registers(tmp_path: Path) -> None:
     plugin_file = tmp_path / "my_plugin.py"
     plugin_file.write_text('''
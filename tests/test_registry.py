@@ -173,6 +173,17 @@ def test_registry_list_available_after_register() -> None:
     assert "mock" in avail["stages"]
 
 
+def test_registry_copy_is_independent() -> None:
+    """copy() keeps registrations and options; later registrations are not shared."""
+    reg = ComponentRegistry()
+    reg.register_llm("mock", _MockLLM, api_key="k")
+    clone = reg.copy()
+    clone.register_stage("mock", _MockStage)
+    assert clone.list_available()["llm_providers"] == ["mock"]
+    assert clone._llm_options == {"mock": {"api_key": "k"}}
+    assert reg.list_available()["stages"] == []
+
+
 def test_registry_duplicate_registration_logs_warning(caplog: pytest.LogCaptureFixture) -> None:
     """Registering the same name twice logs a warning but succeeds."""
     import logging
@@ -5,7 +5,6 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-import pytest
 from click.testing import CliRunner
 
 from futagassist.cli import (
@@ -25,11 +24,6 @@ from futagassist.core.schema import (
 # ── helpers ──────────────────────────────────────────────────────────────
 
 
-@pytest.fixture
-def runner() -> CliRunner:
-    return CliRunner()
-
-
 def _make_mock_stage(name: str, *, success: bool = True, message: str = "") -> MagicMock:
     """Create a mock stage that returns a predetermined StageResult."""
     stage = MagicMock()